@@ -0,0 +1,72 @@
+import numpy
+
+class TileAnimator:
+    '''
+    Keeps track of the tiles that are moving or pulsing, so a still board
+    costs nothing per frame.
+
+    Tiles given to fall() drop toward their target. Each step() moves
+    every unpaused one at once as numpy arrays and forgets the ones that
+    have landed. Tiles given to beacon() pulse while they are attack
+    tiles about to strike. Tile coords are written back every step, so
+    they are what the renderer sees. The arrays are rebuilt from the
+    tiles on every fall(), which also picks up tiles moved by hand since.
+    '''
+    gravity = .4
+
+    def __init__(self):
+        self.ay = numpy.zeros(0)
+        self.beacons = {} # tile -> None, in registration order
+        self.falling = [] # Tiles, in array order
+        self.target = numpy.zeros(0)
+        self.y = numpy.zeros(0)
+
+    def __bool__(self):
+        return bool(self.falling or self.beacons)
+
+    def beacon(self, tiles):
+        for tile in tiles:
+            if tile.tile_type == 'attack' and tile.event_timer == 1:
+                self.beacons[tile] = None
+
+    def fall(self, tiles):
+        falling = dict.fromkeys(self.falling)
+        for tile in tiles:
+            if tile.coords != tile.target:
+                falling[tile] = None
+        self.falling = list(falling)
+        self.ay = numpy.array([t.ay for t in self.falling], dtype=float)
+        self.target = numpy.array([t.target[1] for t in self.falling], dtype=float)
+        self.y = numpy.array([t.coords[1] for t in self.falling], dtype=float)
+
+    def step(self):
+        '''
+        Advances one frame. Returns whether any tile fell this frame
+        (tiles held paused by the event queue wait where they are).
+        '''
+        moved = False
+        if self.falling:
+            active = ~numpy.fromiter((t.paused for t in self.falling), dtype=bool, count=len(self.falling))
+            moved = bool(active.any())
+            if moved:
+                self.ay[active] += self.gravity
+                self.y[active] = numpy.minimum(self.y[active] + self.ay[active], self.target[active])
+                landed = active & (self.y == self.target)
+                self.ay[landed] = 0
+                for tile, y, ay in zip(self.falling, self.y.tolist(), self.ay.tolist()):
+                    if not tile.paused:
+                        tile.ay = ay
+                        tile.coords = (tile.coords[0], y)
+                if landed.any():
+                    keep = ~landed
+                    self.falling = [t for t, k in zip(self.falling, keep.tolist()) if k]
+                    self.ay = self.ay[keep]
+                    self.target = self.target[keep]
+                    self.y = self.y[keep]
+
+        for tile in list(self.beacons):
+            if tile.tile_type == 'attack' and tile.event_timer == 1:
+                tile.animate_beacon()
+            else:
+                del self.beacons[tile]
+        return moved
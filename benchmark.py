@@ -0,0 +1,75 @@
+'''
+Stress test for GFXSurf: fills an enlarged board's worth of tiles with
+ghosts, arcs and HP deltas and times each frame of blit_gfx.
+
+    python benchmark.py [columns] [frames]
+
+Set SDL_VIDEODRIVER=dummy to run without a window.
+'''
+
+import os, random, sys, time
+import pygame
+
+import gameboard, hexgrid
+
+class BenchTile:
+    # Just what GFXSurf.create_ghost reads from a tile
+    def __init__(self, col, row, fonts, colors):
+        self.bg_color = colors['bg_normal']
+        self.coords = (col * 48, row * 48 + (0 if col % 2 else 24))
+        self.dims = (48, 48)
+        self.letter = random.choice('ABCDEFGHIJKLMNOPRSTUVWXYZ')
+        self.look = (self.letter,)
+        self.middle = (self.coords[0] + 24, self.coords[1] + 24)
+        self.surf = pygame.Surface(self.dims)
+        self.surf.fill(colors['light_gray'])
+        pygame.draw.rect(self.surf, self.bg_color, pygame.Rect((2, 2), (44, 44)))
+        text = fonts['large'].render(self.letter, True, colors['black'], self.bg_color)
+        self.surf.blit(text, dest=(12, 4))
+
+def main(cols=25, frames=600):
+    pygame.init()
+    topology = hexgrid.HexTopology(cols=cols)
+    window = pygame.display.set_mode((cols * 48, 8 * 48 + 24))
+    font_filepath = os.path.join(os.path.dirname(__file__), 'VCR_OSD_MONO.ttf')
+    fonts = {'large': pygame.font.Font(font_filepath, 36), 'medium': pygame.font.Font(font_filepath, 18)}
+    colors = {
+        'bg_normal': pygame.Color('#c1a663'),
+        'black': pygame.Color('#000000'),
+        'gold': pygame.Color('#fce803'),
+        'green': pygame.Color('#65a669'),
+        'light_gray': pygame.Color('#bfb9a8'),
+        'red': pygame.Color('#e05a41'),
+        'teal': pygame.Color('#50aef2'),
+        'transparent': pygame.Color('#ff00ff')
+    }
+    tiles = [BenchTile(col, row, fonts, colors) for col, row in topology.positions]
+    gfx = gameboard.GFXSurf(fonts, colors)
+    gfx.fps = 60
+    background = pygame.Surface(window.get_size())
+    background.fill(pygame.Color('#38424d'))
+
+    directions = ['n', 'ne', 'se', 's', 'sw', 'nw']
+    times = []
+    peak = 0
+    for frame in range(frames):
+        # Keep the board busy: a cascade's worth of ghosts every few frames
+        if frame % 10 == 0:
+            for tile in random.sample(tiles, min(len(tiles), 150)):
+                motion = random.choice(['rise', 'burst'])
+                gfx.create_ghost(tile, colors[random.choice(['gold', 'red', 'teal'])], motion, random.choice(directions))
+            for tile in random.sample(tiles, 10):
+                gfx.draw_arcs([[tile.middle, 'teal', random.randint(1, 9), 'HP', 20]])
+        window.blit(background, (0, 0))
+        start = time.perf_counter()
+        gfx.blit_gfx(window)
+        times.append(time.perf_counter() - start)
+        peak = max(peak, gfx.count)
+        pygame.display.update()
+
+    times.sort()
+    print(f'{len(tiles)} tiles, {frames} frames, up to {peak} gfx at once')
+    print(f'blit_gfx: median {times[len(times) // 2] * 1000:.2f} ms, 95th percentile {times[int(len(times) * .95)] * 1000:.2f} ms, worst {times[-1] * 1000:.2f} ms (60 FPS budget: 16.67 ms)')
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:3]])
@@ -0,0 +1,266 @@
+'''
+Minimized DAWG (directed acyclic word graph) dictionary backend, for word
+lists far larger than compendium.txt. Shared suffixes are stored once, and
+each edge carries the number of words that sort before it, so a word's
+index (and with it its rarity) falls out of the same walk that checks
+membership.
+
+File layout (native byte order, every section 8-byte aligned):
+    header      see HEADER below
+    first_edge  uint32[nodes + 1]  edges of node n are
+                first_edge[n]:first_edge[n + 1]
+    targets     uint32[edges]
+    skips       uint32[edges]      words sorting before this edge's subtree
+    rarities    uint16[words]      rarity * RARITY_SCALE, in word order
+    length_starts
+                uint32[lengths + 1] words of length n are
+                length_ids[length_starts[n]:length_starts[n + 1]]
+    length_ids  uint32[words]      word indices by length, then rarity
+    final       uint8[nodes]       1 if node ends a word
+    heights     uint8[nodes]       bytes in the longest word below node
+    labels      uint8[edges]       edge bytes (UTF-8), sorted per node
+
+compendium.txt (77,741 words) compiles to 28,478 nodes / 61,944 edges: a
+1,167 KB file, 15.4 bytes per word, mapped read-only (the length index
+for bonus words is 4 of those bytes). The [str, float] list it replaces
+cost ~160 bytes per word of Python heap.
+
+Compile a word list (one "word,rarity" per line) with:
+    python dawg.py words.txt words.dawg
+'''
+
+import mmap, os, struct, sys
+from array import array
+
+import lexicon
+
+BYTES = [bytes((i,)) for i in range(256)]
+
+DAWG_VERSION = 3
+HEADER = struct.Struct('=8sIIIIIII')
+MAGIC = b'SNEKDAWG'
+RARITY_SCALE = 100
+
+class Dawg:
+    start = 0
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+        header = HEADER.unpack_from(buffer, 0)
+        self.word_count, node_count, edge_count, length_count, self.rarity_scale = header[3:]
+        view = memoryview(buffer)
+        for name, typecode, start, length in layout(self.word_count, node_count, edge_count, length_count):
+            if typecode == 'B':
+                setattr(self, name, view[start:start + length])
+            else:
+                setattr(self, name, view[start:start + length * array(typecode).itemsize].cast(typecode))
+            if name == 'labels':
+                self.labels_start = start
+        self._length_index = None
+
+    def __contains__(self, word):
+        return self.index(word) >= 0
+
+    def __iter__(self):
+        for word, _ in self.items():
+            yield word
+
+    def __len__(self):
+        return self.word_count
+
+    @property
+    def automaton(self):
+        # The graph is its own prefix automaton
+        return self
+
+    @property
+    def length_index(self):
+        if self._length_index is None:
+            self._length_index = lexicon.LengthIndex(self.length_starts, self.length_ids, lambda i: self.rarities[i] / self.rarity_scale, self.word)
+        return self._length_index
+
+    def edge(self, state, byte):
+        base = self.labels_start
+        i = self.buffer.find(BYTES[byte], base + self.first_edge[state], base + self.first_edge[state + 1])
+        return i - base if i >= 0 else -1
+
+    def has_prefix(self, prefix):
+        return self.step(self.start, prefix) is not None
+
+    def height(self, state):
+        return self.heights[state]
+
+    def index(self, word):
+        state = self.start
+        index = 0
+        for byte in word.encode():
+            i = self.edge(state, byte)
+            if i < 0:
+                return -1
+            index += self.skips[i]
+            state = self.targets[i]
+        return index if self.final[state] else -1
+
+    def is_word(self, state):
+        return state is not None and bool(self.final[state])
+
+    def items(self):
+        # Depth-first in label order visits words in index order
+        stack = [(self.start, b'')]
+        index = 0
+        while stack:
+            state, prefix = stack.pop()
+            if self.final[state]:
+                yield prefix.decode(), self.rarities[index] / self.rarity_scale
+                index += 1
+            for i in range(self.first_edge[state + 1] - 1, self.first_edge[state] - 1, -1):
+                stack.append((self.targets[i], prefix + BYTES[self.labels[i]]))
+
+    def rarity(self, word):
+        i = self.index(word)
+        return self.rarities[i] / self.rarity_scale if i >= 0 else None
+
+    def step(self, state, chars):
+        for byte in chars.encode():
+            if state is None:
+                return None
+            i = self.edge(state, byte)
+            state = self.targets[i] if i >= 0 else None
+        return state
+
+    def word(self, index):
+        # The skips that index() adds up, walked back down
+        state = self.start
+        word = b''
+        while index or not self.final[state]:
+            i = self.first_edge[state + 1] - 1
+            while self.skips[i] > index:
+                i -= 1
+            index -= self.skips[i]
+            word += BYTES[self.labels[i]]
+            state = self.targets[i]
+        return word.decode()
+
+class BuildNode:
+    __slots__ = ('edges', 'final')
+
+    def __init__(self):
+        self.edges = {}
+        self.final = False
+
+    def signature(self):
+        return (self.final, tuple((byte, id(child)) for byte, child in sorted(self.edges.items())))
+
+def build(entries):
+    # Incremental construction of a minimal DAWG from sorted input
+    # (Daciuk et al., 2000), over the UTF-8 bytes of each word
+    entries = sorted((word.encode(), rarity) for word, rarity in dict(entries).items())
+    root = BuildNode()
+    register = {}
+    unchecked = []
+    previous = b''
+
+    def minimize(down_to):
+        while len(unchecked) > down_to:
+            parent, byte, child = unchecked.pop()
+            key = child.signature()
+            if key in register:
+                parent.edges[byte] = register[key]
+            else:
+                register[key] = child
+
+    for word, _ in entries:
+        common = 0
+        while common < min(len(word), len(previous)) and word[common] == previous[common]:
+            common += 1
+        minimize(common)
+        node = unchecked[-1][2] if unchecked else root
+        for byte in word[common:]:
+            child = BuildNode()
+            node.edges[byte] = child
+            unchecked.append((node, byte, child))
+            node = child
+        node.final = True
+        previous = word
+    minimize(0)
+
+    ids = {id(root): 0}
+    nodes = [root]
+    for node in nodes:
+        for _, child in sorted(node.edges.items()):
+            if id(child) not in ids:
+                ids[id(child)] = len(nodes)
+                nodes.append(child)
+
+    counts = {}
+    heights = {}
+    def count(node):
+        # Recursion depth is bounded by the longest word
+        if id(node) not in counts:
+            counts[id(node)] = node.final + sum(count(child) for child in node.edges.values())
+            heights[id(node)] = min(max((heights[id(child)] + 1 for child in node.edges.values()), default=0), 255)
+        return counts[id(node)]
+    count(root)
+
+    first_edge = array('I', [0])
+    targets = array('I')
+    skips = array('I')
+    labels = bytearray()
+    final = bytearray()
+    for node in nodes:
+        skip = int(node.final)
+        for byte, child in sorted(node.edges.items()):
+            labels.append(byte)
+            targets.append(ids[id(child)])
+            skips.append(skip)
+            skip += counts[id(child)]
+        first_edge.append(len(targets))
+        final.append(node.final)
+    rarities = array('H', [round(rarity * RARITY_SCALE) for _, rarity in entries])
+    length_starts, length_ids = lexicon.length_buckets([len(word.decode()) for word, _ in entries], rarities)
+
+    counts = (len(entries), len(nodes), len(targets), len(length_starts) - 1)
+    out = bytearray(HEADER.pack(MAGIC, DAWG_VERSION, lexicon.BYTE_ORDER, *counts, RARITY_SCALE))
+    sections = (first_edge, targets, skips, rarities, length_starts, length_ids, bytes(final), bytes(heights[id(node)] for node in nodes), bytes(labels))
+    for (_, _, start, _), data in zip(layout(*counts), sections):
+        out += bytes(start - len(out))
+        out += data if isinstance(data, bytes) else data.tobytes()
+    return bytes(out)
+
+def compile_file(source_path, dawg_path):
+    with open(source_path, encoding='utf-8') as file:
+        data = build(lexicon.parse_compendium(file.read()))
+    tmp_path = f'{dawg_path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as file:
+        file.write(data)
+    os.replace(tmp_path, dawg_path)
+
+def layout(word_count, node_count, edge_count, length_count):
+    sections = []
+    pos = lexicon.align(HEADER.size)
+    for name, typecode, length in (
+        ('first_edge', 'I', node_count + 1),
+        ('targets', 'I', edge_count),
+        ('skips', 'I', edge_count),
+        ('rarities', 'H', word_count),
+        ('length_starts', 'I', length_count + 1),
+        ('length_ids', 'I', word_count),
+        ('final', 'B', node_count),
+        ('heights', 'B', node_count),
+        ('labels', 'B', edge_count)
+    ):
+        sections.append((name, typecode, pos, length))
+        pos = lexicon.align(pos + length * array(typecode).itemsize)
+    return sections
+
+def load(path):
+    with open(path, 'rb') as file:
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    if len(buffer) < HEADER.size or HEADER.unpack_from(buffer, 0)[:3] != (MAGIC, DAWG_VERSION, lexicon.BYTE_ORDER):
+        raise ValueError(f'{path} is not a compatible DAWG file')
+    return Dawg(buffer)
+
+if __name__ == '__main__':
+    if len(sys.argv) != 3:
+        raise SystemExit('Usage: python dawg.py <word list> <output.dawg>')
+    compile_file(sys.argv[1], sys.argv[2])
@@ -0,0 +1,92 @@
+class Event:
+    __slots__ = ('active', 'direction', 'event', 'ghost_color_override', 'heal', 'hp_change', 'precedence', 'result', 'source_tile', 'tile')
+
+    def __init__(self, event, tile, precedence, source_tile=None, ghost_color_override=None, direction=None):
+        self.active = True
+        self.direction = direction
+        self.event = event
+        self.ghost_color_override = ghost_color_override
+        # Outcome, filled in by rules.play_turn()
+        self.heal = 0
+        self.hp_change = 0
+        self.precedence = precedence
+        self.result = None
+        self.source_tile = tile if source_tile is None else source_tile
+        self.tile = tile
+
+class EventQueue:
+    '''
+    Events bucketed by precedence; batches come out lowest precedence
+    first, in the order they were added. Pending events are also indexed
+    by source tile, so removing a tile can deactivate everything it was
+    the source of without scanning the rest of the queue.
+    '''
+    def __init__(self):
+        self.buckets = {}   # precedence -> [event, ...]
+        self.by_source = {} # source tile -> {event: None}
+        self.length = 0
+
+    def __bool__(self):
+        return bool(self.length)
+
+    def __len__(self):
+        return self.length
+
+    def add(self, event):
+        self.buckets.setdefault(event.precedence, []).append(event)
+        self.by_source.setdefault(event.source_tile, {})[event] = None
+        self.length += 1
+        return event
+
+    def discard_source(self, tile):
+        # Deactivates and returns the pending events sourced from tile
+        discarded = list(self.by_source.pop(tile, ()))
+        for event in discarded:
+            event.active = False
+        return discarded
+
+    def pop_batch(self):
+        if not self.buckets:
+            return []
+        batch = self.buckets.pop(min(self.buckets))
+        for event in batch:
+            pending = self.by_source.get(event.source_tile)
+            if pending is not None:
+                pending.pop(event, None)
+        self.length -= len(batch)
+        return batch
+
+def resolve_gold_cascade(origin, neighbors, direction, precedence=2):
+    '''
+    Events set off by gold tile origin, resolved at the given precedence.
+    Gold fires one step later than the tile that set it off and takes out
+    its neighbors at its own precedence: heal tiles heal, gold tiles chain
+    on, anything else explodes. Each tile is claimed once, by whichever
+    gold tile reaches it first walking depth-first from origin, and events
+    come back in the order the recursive walk used to queue them (each
+    gold event after the events it set off).
+
+    neighbors(tile) returns the tiles around tile; direction(tile, source)
+    is the compass direction from source to tile, for explode ghosts.
+    '''
+    cascade = []
+    visited = {origin}
+    stack = [(Event('gold', origin, precedence + 1), iter(neighbors(origin)))]
+    while stack:
+        gold, pending = stack[-1]
+        for tile in pending:
+            if tile in visited:
+                continue
+            visited.add(tile)
+            if tile.tile_type == 'heal':
+                cascade.append(Event('heal', tile, gold.precedence))
+            elif tile.tile_type == 'gold':
+                # Finish this gold tile's cascade before its siblings
+                stack.append((Event('gold', tile, gold.precedence + 1), iter(neighbors(tile))))
+                break
+            else:
+                cascade.append(Event('explode', tile, gold.precedence, source_tile=gold.tile, ghost_color_override='gold', direction=direction(tile, gold.tile)))
+        else:
+            stack.pop()
+            cascade.append(gold)
+    return cascade
@@ -0,0 +1,39 @@
+import pygame
+
+class FrameGovernor:
+    '''
+    Paces the main loop. While anything is animating it runs at the full
+    frame rate; once the game reports idle it sleeps in pygame.event.wait()
+    until the next event arrives (or idle_timeout ms pass) and is back at
+    full rate from the frame that handles it.
+    '''
+    def __init__(self, fps=60, idle_timeout=1000):
+        self.clock = pygame.time.Clock()
+        self.fps = fps
+        self.idle_timeout = idle_timeout
+        self.measured_fps = 0 # Frame rate over full-rate frames only
+        self.since_wait = 0   # Frames since the last idle wait
+        self.woken = []       # Event that ended an idle wait
+
+    def events(self):
+        # This frame's events, starting with the one that ended a wait
+        events = self.woken + pygame.event.get()
+        self.woken = []
+        return events
+
+    def tick(self, idle):
+        '''
+        Waits out the rest of the frame, or until the next event if idle.
+        Returns the seconds since the last frame.
+        '''
+        if idle and not pygame.event.peek():
+            event = pygame.event.wait(self.idle_timeout)
+            if event.type != pygame.NOEVENT:
+                self.woken.append(event)
+            self.since_wait = 0
+        dt = self.clock.tick(self.fps) / 1000
+        self.since_wait += 1
+        # The clock averages over its last 10 frames; keep waits out of it
+        if self.since_wait > 10:
+            self.measured_fps = self.clock.get_fps()
+        return dt
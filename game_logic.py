@@ -1,8 +1,8 @@
-import glob, json, os, pygame, random, threading
+import glob, json, os, pygame, random
 from datetime import datetime
 from math import ceil, floor
 
-import gameboard, tile_snake
+import animation, events, gameboard, hexgrid, rules, scheduler, solver, tile_snake, tracing
 from ui import Interactive, Tile
 
 class Game:
@@ -49,90 +49,46 @@ class Game:
             'transparent': pygame.Color('#ff00ff')
         }
 
+        self.tracer = tracing.tracer
+        if debug:
+            self.tracer.configure(level=tracing.DEBUG, echo=True)
+
         self.animating = False
+        self.animator = animation.TileAnimator() # Falling and beaconing tiles
         self.board = gameboard.Board(dims=dims, coords=(0, 0), colors=self.colors)
-        self.debug_mode = debug
         self.dictionary = dictionary
         self.hi_scores = self.load_hi_scores()
+        self.highlighted = {} # Tiles highlighted from the keyboard
+        self.input_disabled = False
         self.uncurrent_hi_scores()
         self.max_history_words = 17
         self.mode = 'menu'
         self.player_name = 'SNEK'
-        self.queue = []
-        self.snake = tile_snake.Snake()
+        self.queue = events.EventQueue()
+        # Seconds between event precedence steps
+        self.scheduler = scheduler.Scheduler(step_duration=0.2)
+        self.scrambling = False # Until scramble()'s event queue has run
+        self.snake = tile_snake.Snake(dictionary.automaton)
+        self.solver = solver.BoardSolver(dictionary.automaton)
         tile_offset = gameboard.offset_from_element(self.board.level_display, corner=(0, 1), offset=(0, 10))
         self.tiles = self.board.create_tiles(self.colors, offset=tile_offset)
+        self.grid = hexgrid.TileGrid(self.board.topology, self.tiles)
 
         self.board.create_splash_menu(self.hi_scores)
         self.board.ui_elements = self.board.splash_elements
         self.load_tutorial_images()
         self.load_sfx()
 
-    def add_gold_tile_event(self, tile, precedence=2, traversed=None, source_tile=None):
-        if not traversed:  # Have to use this workaround due to behavior
-            traversed = [] # of mutable defaults in Python
-        traversed.append(tile.identify())
-        if tile.tile_type == 'heal':
-            self.print_log(f'Creating heal event @ {tile.identify()} from gold tile neighbor')
-            event = {
-                'event': 'heal',
-                'tile': tile,
-                'source_tile': tile,
-                'precedence': precedence,
-                'ghost_color_override': None,
-                'active': True,
-                'direction': None
-            }
-            return event
-        elif tile.tile_type == 'gold':
-            self.print_log(f'Creating gold event @ {tile.identify()}')
-            precedence += 1
-            event = {
-                'event': 'gold',
-                'tile': tile,
-                'source_tile': tile,
-                'precedence': precedence,
-                'ghost_color_override': None,
-                'active': True,
-                'direction': None
-            }
-            source_tile = tile
-            for t in self.get_neighbors(tile):
-                if not t.identify() in traversed:
-                    self.queue.append(self.add_gold_tile_event(t, precedence, traversed, source_tile))
-            return event
-        else:
-            self.print_log(f'Creating explode event @ {tile.identify()}')
-            event = {
-                'event': 'explode',
-                'tile': tile,
-                'source_tile': source_tile,
-                'precedence': precedence,
-                'ghost_color_override': 'gold',
-                'active': True,
-                'direction': self.get_ghost_direction(tile, source_tile)
-            }
-            return event
-
     def add_tile(self, tile):
         self.snake.add(tile)
+        self.tracer.debug('snake', 'Added {}; snake is "{}"', tile.identify, self.snake.word)
 
     def animate(self):
-        to_animate = [t for t in self.tiles if t.target != t.coords and not t.paused]
-        if to_animate:
+        if self.animator.step():
             self.animating = True
-        for t in to_animate:
-            t.ay += .4
-            t.coords = (t.coords[0], min(t.coords[1] + t.ay, t.target[1]))
-            if t.coords[1] == t.target[1]:
-                t.ay = 0
-
-        if self.animating and not to_animate:
+        elif self.animating:
             self.input_disabled = False
 
-        for tile in [t for t in self.tiles if t.event_timer == 1 and t.tile_type == 'attack']:
-            tile.animate_beacon()
-
         d = self.board.level_display
         if d.progress > d.progress_actual:
             d.progress = 0
@@ -164,10 +120,16 @@ class Game:
         d.progress_actual += exp
         d.update()
 
+    def board_state(self):
+        # The live tiles, read but never changed by the rules
+        specials = sorted((t.col, t.row) for tile_type in rules.SPECIAL_TYPES for t in self.grid.with_type(tile_type))
+        h = self.board.hp_display
+        return rules.BoardState(self.board.topology, self.grid.positions, h.hp, h.hp_max, specials)
+
     def check_dictionary(self):
         if self.god_mode:
             return True
-        return bool(self.snake.word.lower() in [x[0] for x in self.dictionary])
+        return self.snake.is_word()
 
     def check_level_progress(self):
         return bool(self.board.level_display.progress >= self.board.level_display.progress_max)
@@ -197,8 +159,8 @@ class Game:
     def choose_bonus_word(self):
         self.prev_bonus = self.bonus_word
         r_values = [0, 0, 0, 0.16, 0.22, 0.28, 0.36, 0.42, 0.48, 0.55, 0.61, 0.68, 0.74, 0.8, 0.87, 0.93, 0.99, 1.07, 1.13, 1.28, 1.31, 1.38]
-        word_pool = [w[0] for w in self.dictionary if len(w[0]) == self.bonus_counter and w[1] > r_values[self.bonus_counter]]
-        self.bonus_word = random.choice(word_pool).upper()
+        word = self.dictionary.length_index.choose_above(self.bonus_counter, r_values[self.bonus_counter])
+        self.bonus_word = word.upper()
 
     def clear_marked(self):
         for tile in [t for t in self.tiles if t.marked]:
@@ -224,7 +186,7 @@ class Game:
         return word
 
     def commit_word_to_history(self, word):
-        self.print_log(f'----Committed word "{word}"----')
+        self.tracer.info('snake', 'Committed word "{}"', word)
         color = 'green' if word == self.bonus_word else 'beige'
         # Account for 'Qu' tiles
         letters_in_word = [t.letter for t in self.snake.tiles]
@@ -246,91 +208,15 @@ class Game:
         self.last_five_words = [len(w['word']) for w in self.history[-5:]]
 
     def create_event_queue(self, ghost_color=None):
-        self.print_log('Creating event queue...')
-        self.queue = []
-        for tile in self.snake.tiles:
-            if tile.tile_type == 'heal':
-                self.print_log(f'Creating heal event @ {tile.identify()}')
-                event = {
-                    'event': 'heal',
-                    'tile': tile,
-                    'source_tile': tile,
-                    'precedence': 0,
-                    'ghost_color_override': None,
-                    'active': True,
-                    'direction': None
-                }
-                self.queue.append(event)
-            elif tile.tile_type == 'gold':
-                self.queue.append(self.add_gold_tile_event(tile))
-            else:
-                self.print_log(f'Creating remove event @ {tile.identify()}')
-                ghost_color_override = 'green' if self.snake.word == self.prev_bonus else None
-                event = {
-                    'event': 'remove',
-                    'tile': tile,
-                    'source_tile': tile,
-                    'precedence': 2,
-                    'ghost_color_override': ghost_color_override,
-                    'active': True,
-                    'direction': None
-                }
-                self.queue.append(event)
-        for tile in self.tiles:
-            if tile.tile_type == 'poison':
-                self.print_log(f'Creating poison event @ {tile.identify()}')
-                event = {
-                    'event': 'poison',
-                    'tile': tile,
-                    'source_tile': tile,
-                    'precedence': 4,
-                    'ghost_color_override': None,
-                    'active': True,
-                    'direction': None
-                }
-                self.queue.append(event)
-            elif tile.tile_type == 'attack':
-                if tile.event_timer == 1:
-                    self.print_log(f'Creating attack event @ {tile.identify()}')
-                    event = {
-                        'event': 'attack',
-                        'source_tile': tile,
-                        'tile': tile,
-                        'precedence': 5,
-                        'ghost_color_override': None,
-                        'active': True,
-                        'direction': None
-                    }
-                    self.queue.append(event)
-                    for t in self.get_neighbors(tile):
-                        self.print_log(f'Creating kill event @ {t.identify()}')
-                        event = {
-                            'event': 'kill',
-                            'source_tile': tile,
-                            'tile': t,
-                            'precedence': 5,
-                            'ghost_color_override': 'red',
-                            'active': True,
-                            'direction': self.get_ghost_direction(t, tile)
-                        }
-                        self.queue.append(event)
-                else:
-                    self.print_log(f'Creating tick event @ {tile.identify()}')
-                    event = {
-                        'event': 'tick',
-                        'tile': tile,
-                        'source_tile': tile,
-                        'precedence': 6,
-                        'ghost_color_override': None,
-                        'active': True,
-                        'direction': None
-                    }
-                    self.queue.append(event)
-        # Sort event queue by precedence
-        self.queue = sorted(self.queue, key=lambda k: k['precedence'])
-        if self.queue:
-            self.group_queue_by_precedence()
-        self.print_log(f'Event queue creation complete: {sum([len(l) for l in self.queue])} events in queue')
+        self.tracer.debug('events', 'Creating event queue...')
+        ghost_color_override = 'green' if self.snake.word == self.prev_bonus else None
+        path = [(t.col, t.row) for t in self.snake.tiles]
+        resolved = rules.play_turn(self.board_state(), path, ghost_color_override=ghost_color_override)
+        self.queue = events.EventQueue()
+        for event in resolved:
+            self.tracer.debug('events', 'Creating {} event @ {}', event.event, event.tile.identify)
+            self.queue.add(event)
+        self.tracer.debug('events', 'Event queue creation complete: {} events in queue', len(self.queue))
 
     def create_tile_from_last_5(self):
         # Based on len of last 5 words
@@ -350,14 +236,10 @@ class Game:
         return tile_type
 
     def execute_event_queue(self):
-        # ---- DEBUG STUFF ----
-        if self.queue:
-            current_precedence = self.queue[0][0]['precedence']
-            self.print_log(f'Event precedence: {current_precedence}')
-            self.print_log('Events scheduled for this round:')
-            self.print_log('    ' + '; '.join([e['event'] + ' ' + e['tile'].identify() for e in self.queue[0]]))
-        # ---- DEBUG STUFF ----
-        if not self.queue:
+        batch = self.queue.pop_batch()
+        if batch:
+            self.tracer.debug('events', 'Precedence {} events: {}', batch[0].precedence, lambda: '; '.join([e.event + ' ' + e.tile.identify() for e in batch]))
+        if not batch:
             if self.snake.length:
                 self.update_tile_rows()
                 self.roll_create_special_tile(self.snake.length)
@@ -365,21 +247,25 @@ class Game:
                 self.update_word_display()
             else:
                 self.animating = True
-            self.print_log('Queue empty; unpausing all tiles')
+            self.tracer.debug('events', 'Queue empty; unpausing all tiles')
             self.update_tile_rows()
             for tile in [t for t in self.tiles if t.paused]:
                 tile.paused = False
+            if self.scrambling:
+                # scramble() checks the board itself once it has rerolled
+                self.scrambling = False
+                self.update_words_left()
+            elif self.mode == 'play' and not self.update_words_left() and self.board.hp_display.hp > 0:
+                # Not the player's doing, so no scramble penalty
+                self.tracer.info('events', 'No words left on the board; rerolling letters')
+                self.reroll_letters()
             return
-        for event in self.queue.pop(0):
-            tile = event['tile']
-            if tile.paused:
-                # Skip this event if another event has already removed
-                # the tile
-                self.print_log(f'{tile.identify()} already removed')
-                continue
-            action = event['event']
-            if event['ghost_color_override']:
-                color = event['ghost_color_override']
+        h = self.board.hp_display
+        for event in batch:
+            tile = event.tile
+            action = event.event
+            if event.ghost_color_override:
+                color = event.ghost_color_override
             else:
                 if tile.tile_type == 'attack':
                     color = 'red'
@@ -395,64 +281,69 @@ class Game:
                     color = 'beige'
 
             if action == 'heal':
-                h = self.board.hp_display
                 if h.hp == h.hp_max:
-                    h.hp_max += tile.multiplier
                     arc_sources = [tile.middle, 'teal', f'{tile.multiplier} MAX', 'HP_MAX', 0]
                     self.board.gfx.draw_arcs([arc_sources])
-                    self.print_log(f'{tile.identify()} increased HP MAX')
+                    self.tracer.debug('events', '{} increased HP MAX', tile.identify)
                 else:
-                    h.hp = min(h.hp + tile.multiplier, h.hp_max)
                     arc_sources = [tile.middle, 'teal', tile.multiplier, 'HP', 20]
                     self.board.gfx.draw_arcs([arc_sources])
-                    self.print_log(f'{tile.identify()} healed HP')
+                    self.tracer.debug('events', '{} healed HP', tile.identify)
+                h.hp, h.hp_max = rules.apply_hp(event, h.hp, h.hp_max)
                 self.board.gfx.create_ghost(tile, self.colors[color])
-                self.remove_tile(tile)
+                self.remove_tile(tile, event.result)
                 h.update()
             elif action in ('explode', 'gold', 'kill', 'remove'):
-                if event['active']:
-                    if action in ('gold', 'remove'):
-                        motion = 'rise'
-                    else:
-                        motion = 'burst'
-                    self.board.gfx.create_ghost(tile, self.colors[color], motion, event['direction'])
-                    self.print_log(f'{action} event: {tile.identify()} was removed')
-                    self.remove_tile(tile)
-                    for precedence in self.queue:
-                        for evt in [e for e in precedence if e['source_tile'] == tile]:
-                            self.print_log(f'{tile.identify()} was the source tile for {evt["tile"].identify()}\'s {evt["event"]} event; discarding that event')
-                            evt['active'] = False
+                if action in ('gold', 'remove'):
+                    motion = 'rise'
                 else:
-                    self.print_log('Event was discarded')
+                    motion = 'burst'
+                self.board.gfx.create_ghost(tile, self.colors[color], motion, event.direction)
+                self.tracer.debug('events', '{} event: {} was removed', action, tile.identify)
+                self.remove_tile(tile, event.result)
             elif action == 'poison':
-                tile.poison_tick()
-                tile.update()
-                h = self.board.hp_display
-                h.hp -= tile.multiplier
-                arc_sources = [tile.middle, 'poison_bright', tile.multiplier * -1, 'HP', -20]
+                h.hp += event.hp_change
+                tile.apply_state(event.result)
+                arc_sources = [tile.middle, 'poison_bright', event.hp_change, 'HP', -20]
                 self.board.gfx.draw_arcs([arc_sources])
-                self.print_log(f'{tile.identify()} dealt {tile.multiplier * -1} poison damage')
+                self.tracer.debug('events', '{} dealt {} poison damage', tile.identify, event.hp_change)
             elif action == 'attack':
-                tile.attack_tick()
-                tile.update()
-                h = self.board.hp_display
-                h.hp -= tile.point_value
-                arc_sources = [tile.middle, 'bg_attack', tile.point_value * -1, 'HP', -20]
+                h.hp += event.hp_change
+                arc_sources = [tile.middle, 'bg_attack', event.hp_change, 'HP', -20]
                 self.board.gfx.create_ghost(tile, self.colors[color])
-                self.print_log(f'{tile.identify()} dealt {tile.point_value * -1} damage')
+                self.tracer.debug('events', '{} dealt {} damage', tile.identify, event.hp_change)
                 self.board.gfx.draw_arcs([arc_sources])
-                self.remove_tile(tile)
+                self.remove_tile(tile, event.result)
             elif action == 'tick':
-                tile.attack_tick()
-                tile.update()
-                self.print_log(f'{tile.identify()} ticked to "{tile.event_timer}"')
-        threading.Timer(0.2, self.execute_event_queue).start()
+                tile.apply_state(event.result)
+                self.animator.beacon([tile])
+                self.tracer.debug('events', '{} ticked to "{}"', tile.identify, tile.event_timer)
+        self.scheduler.schedule(self.execute_event_queue)
 
     def fetch_gamestates(self):
         with open('saved_gamestates.json') as file:
             gamestates = json.load(file)
         return gamestates
 
+    def find_words(self):
+        '''
+        Returns every word that can be traced on the current board, each as
+        a dict with the word (in snake form, e.g. 'QuIT'), one tile path
+        that spells it and its score_word() value.
+        '''
+        board = {pos: t for pos, t in self.grid.positions.items() if t.tile_type != 'stone'}
+        letters = {pos: tile.letter for pos, tile in board.items()}
+        paths = self.solver.update(letters, self.board.topology.neighbors)
+        words = []
+        for word in sorted(paths):
+            entry = {
+                'word': word,
+                'path': [board[pos] for pos in min(paths[word])],
+                'value': self.score_word(word)
+            }
+            words.append(entry)
+        return words
+
     def game_over(self):
         self.mode = 'menu'
         self.board.create_game_over_menu()
@@ -461,47 +352,6 @@ class Game:
     def get_attack_weight(self, avg):
         return -0.375 * avg + 1.975
 
-    def get_ghost_direction(self, ghost_tile, source_tile):
-        if ghost_tile.col == source_tile.col:
-            if ghost_tile.row > source_tile.row:
-                direction = 's'
-            else:
-                direction = 'n'
-        elif source_tile.col % 2:
-            if ghost_tile.col < source_tile.col:
-                if ghost_tile.row == source_tile.row:
-                    direction = 'sw'
-                else:
-                    direction = 'nw'
-            elif ghost_tile.col > source_tile.col:
-                if ghost_tile.row == source_tile.row:
-                    direction = 'se'
-                else:
-                    direction = 'ne'
-        else: # Source tile on even col
-            if ghost_tile.col < source_tile.col:
-                if ghost_tile.row == source_tile.row:
-                    direction = 'nw'
-                else:
-                    direction = 'sw'
-            else:
-                if ghost_tile.row == source_tile.row:
-                    direction = 'ne'
-                else:
-                    direction = 'se'
-        return direction
-
-    def get_neighbors(self, base_tile):
-        neighbors = [t for t in self.tiles if self.board.is_neighbor(new_tile=t, old_tile=base_tile) and not t == base_tile]
-        self.print_log(f'get_neighbors(): Neighbors of {base_tile.tile_type} tile {base_tile.identify()} are: {", ".join([t.identify() for t in neighbors])}')
-        return neighbors
-
-    def group_queue_by_precedence(self):
-        queue = [[] for _ in range(max([e['precedence'] for e in self.queue]) + 1)]
-        for event in self.queue:
-            queue[event['precedence']].append(event)
-        self.queue = [e for e in queue if e] # Ditch empty turns
-
     def handle_menu_btn_click(self, elem):
         if not isinstance(elem, Interactive):
             return
@@ -625,7 +475,7 @@ class Game:
             self.board.ui_elements = self.board.splash_elements
 
     def highlight_selected_tiles(self):
-        for tile in [t for t in self.tiles if t.selected]:
+        for tile in [t for t in self.tiles if t.selected and t not in self.snake.tiles]:
             tile.unselect()
         for tile in self.snake.tiles:
             tile.select()
@@ -639,10 +489,10 @@ class Game:
             self.unhighlight_all()
             self.last_typed = ''
             if self.god_mode:
-                self.print_log('God mode disabled')
+                self.tracer.info('game', 'God mode disabled')
                 self.god_mode = False
             else:
-                self.print_log('God mode enabled')
+                self.tracer.info('game', 'God mode enabled')
                 self.god_mode = True
             return
 
@@ -652,19 +502,32 @@ class Game:
             self.last_typed = ''
         else:
             # Otherwise, highlight all tiles with matching letters
-            for t in self.tiles:
-                if t.letter == letter:
-                    t.highlight()
-                else:
+            matching = dict.fromkeys(self.grid.with_letter(letter))
+            for t in self.highlighted:
+                if t not in matching:
                     t.unhighlight()
+            for t in matching:
+                t.highlight()
+            self.highlighted = matching
             self.last_typed = letter
 
+    def is_idle(self):
+        # True when the screen would stay the same until the next input
+        b = self.board
+        if self.input_disabled or not self.scheduler.idle() or b.gfx.count:
+            return False
+        if b.multiplier_display.marquee or b.bonus_display.marquee:
+            return False
+        if b.level_display.progress != b.level_display.progress_actual or b.hp_display.hp_displayed != b.hp_display.hp:
+            return False
+        return not self.animator
+
     def level_up(self):
         d = self.board.level_display
         d.progress_actual -= d.progress_max
         d.progress_max += self.level * d.progress_lv_increment
         self.level += 1
-        self.print_log(f'Level up: Lv{self.level}')
+        self.tracer.info('game', 'Level up: Lv{}', self.level)
         d.update(self.level)
         buff = self.board.hp_display.level_up(self.level)
         arc_sources = [[(125, 184), 'bg_gold', str(buff), 'HP', 0], [(135, 180), 'bg_gold', f'{buff} MAX', 'HP_MAX', 0]]
@@ -675,7 +538,7 @@ class Game:
     def load_game(self, slot):
         self.new_game()
 
-        self.print_log(f'Loading gamestate from slot {slot}')
+        self.tracer.info('persistence', 'Loading gamestate from slot {}', slot)
         gamestate = self.fetch_gamestates()[slot]
         h = self.board.hp_display
         d = self.board.level_display
@@ -694,18 +557,18 @@ class Game:
         self.word_best = gamestate['best_word']
         self.word_longest = gamestate['longest_word']
 
-        for n, tile in enumerate(self.tiles):
-            load_tile = [t for t in gamestate['tiles'] if t['col'] == tile.col and t['row'] == tile.row][0]
+        saved_tiles = {(t['col'], t['row']): t for t in gamestate['tiles']}
+        for tile in self.tiles:
+            load_tile = saved_tiles[(tile.col, tile.row)]
             tile.event_timer = load_tile['event_timer']
-            tile.col = load_tile['col']
             tile.first_turn = load_tile['first_turn']
             tile.letter = load_tile['letter']
             tile.marked = load_tile['marked']
             tile.multiplier = load_tile['multiplier']
             tile.point_value = load_tile['point_value']
-            tile.row = load_tile['row']
             tile.tile_type = load_tile['tile_type']
             tile.update()
+        self.animator.beacon(self.grid.with_type('attack'))
 
         self.board.best_display.set_colored_text(self.word_best)
         self.update_bonus_display()
@@ -716,6 +579,7 @@ class Game:
         if self.history:
             self.board.history_display.set_multiline_text(self.history)
         self.try_update_hi_scores()
+        self.update_words_left()
 
         self.board.ui_elements = self.tiles + self.board.game_elements
         self.mode = 'play'
@@ -752,9 +616,11 @@ class Game:
         self.board.multiplier_display.marquee = True
         self.board.multiplier_display.marquee_timer = 1
         self.board.bonus_display.border_color = self.colors['mid_gray']
-        self.print_log(f'Multiplier set to {self.multiplier}')
+        self.tracer.info('game', 'Multiplier set to {}', self.multiplier)
 
     def new_game(self):
+        self.scheduler.clear()
+        self.unhighlight_all()
         self.animating = False
         self.bonus_counter = 3
         self.bonus_word = ''
@@ -769,6 +635,7 @@ class Game:
         self.multiplier = 1
         self.prev_bonus = ''
         self.score = 0
+        self.scrambling = False
         self.submitted_word = ''
         self.word_longest = None
         self.word_best = {
@@ -796,7 +663,7 @@ class Game:
 
         self.board.best_display.update(None)
         self.update_bonus_display()
-        self.board.history_display.update(self.history)
+        self.board.history_display.clear_history()
         self.board.longest_display.update(self.word_longest)
         self.board.multiplier_display.update(self.multiplier)
         self.board.score_display.update(self.score)
@@ -804,22 +671,33 @@ class Game:
 
         for t in self.tiles:
             t.reset()
+        self.update_words_left()
 
     def play_sound(self, sound):
         if not self.board.muted:
             self.sfx[sound].play()
 
-    def print_log(self, msg):
-        if self.debug_mode:
-            print(msg)
-
-    def remove_tile(self, tile):
-        tile.reset()
-        self.set_row(tile)
+    def remove_tile(self, tile, refill=None):
+        tile.reset(refill.letter if refill else None)
+        self.grid.remove(tile)
         # Push tiles with negative rows up off the top of the screen
         tile.set_coords(dy = tile.offset[1] * -1 - tile.dims[1])
         tile.paused = True
 
+    def reroll_letters(self):
+        # Reroll until there is something to spell. A board walled in by
+        # stone may never have a word, so give up after a few tries.
+        self.unhighlight_all()
+        self.last_typed = ''
+        for attempt in range(10):
+            for tile in [t for t in self.tiles if t.tile_type == 'normal']:
+                tile.marked = False
+                tile.choose_letter()
+            if self.update_words_left():
+                break
+            self.tracer.info('events', 'No words left after reroll; rerolling again')
+        self.update_tiles()
+
     def roll_create_special_tile(self, snake_length):
         '''
         Creates spcial tiles based on:
@@ -833,7 +711,7 @@ class Game:
         rolling average of player's last 5 word lengths.
         '''
         tiles = [t for t in self.tiles if t.paused]
-        self.print_log(f'roll_create_special_tile(): Rerolling {len(tiles)} tiles')
+        self.tracer.debug('events', 'roll_create_special_tile(): Rerolling {} tiles', len(tiles))
         tile_type = 'normal'
         special_index = 0
 
@@ -849,7 +727,7 @@ class Game:
         if tile_type != 'normal':
             # Randomly choose which new tile will have the special type
             special_index = random.choice(range(len(tiles)))
-            self.print_log(f'New {tile_type} tile @ {tiles[special_index].identify()}')
+            self.tracer.debug('events', 'New {} tile @ {}', tile_type, tiles[special_index].identify)
             tiles[special_index].tile_type = tile_type
             if tile_type == 'attack':
                 self.set_tile_timer(tiles[special_index])
@@ -857,7 +735,7 @@ class Game:
                 tiles[special_index].event_timer = 3
             tiles[special_index].update()
         else:
-            self.print_log('No special tiles created for this batch')
+            self.tracer.debug('events', 'No special tiles created for this batch')
 
     def save_game(self, slot):
         h = self.board.hp_display
@@ -909,12 +787,12 @@ class Game:
 
         self.board.create_game_saved_menu(gamestate['id'], slot)
         self.board.ui_elements += self.board.splash_elements
-        self.print_log(f'Gamestate saved to slot {slot}')
+        self.tracer.info('persistence', 'Gamestate saved to slot {}', slot)
 
     def save_hi_scores(self, scores):
         with open('scores.json', 'w') as file:
             json.dump(scores, file)
-        self.print_log('Hi scores updated')
+        self.tracer.info('persistence', 'Hi scores updated')
 
     def score_word(self, word):
         value = 0
@@ -923,28 +801,28 @@ class Game:
         return value * len(word)
 
     def scramble(self):
-        self.print_log('----Scramble----')
+        if self.scrambling:
+            return
+        self.tracer.info('events', 'Scramble')
         self.input_disabled = True
+        self.scrambling = True
         self.snake.empty()
         self.unhighlight_all()
         self.create_event_queue()
         self.execute_event_queue()
 
         try:
-            atk = random.choice([t for t in self.tiles if (t.row == 0 and t.tile_type == 'normal')])
+            top_row = [self.grid.at(col, 0) for col in range(self.board.topology.cols)]
+            atk = random.choice([t for t in top_row if t and t.tile_type == 'normal'])
             atk.tile_type = 'attack'
             self.set_tile_timer(atk)
             # atk.choose_letter()
             atk.letter = 'Qu'
             atk.update()
         except IndexError:
-            self.print_log('scramble(): No "normal" type tiles on top row')
+            self.tracer.debug('events', 'scramble(): No "normal" type tiles on top row')
             pass
-        for tile in [t for t in self.tiles if t.tile_type == 'normal']:
-            tile.marked = False
-            tile.choose_letter()
-
-        self.update_tiles()
+        self.reroll_letters()
 
     def set_tile_timer(self, tile):
         if tile.tile_type == 'attack':
@@ -958,9 +836,6 @@ class Game:
         else:
             tile.event_timer = 5 # Default for poison tiles
 
-    def set_row(self, tile):
-        tile.row = min([t.row for t in self.tiles if t.col == tile.col]) - 1
-
     def toggle_mark(self, end_click_elem, start_click_elem):
         for elem in (start_click_elem, end_click_elem):
             if not elem:
@@ -999,8 +874,8 @@ class Game:
                 break
             index -= 1
 
-        self.snake.tiles = self.snake.tiles[:index]
-        self.snake.update()
+        self.snake.trim(index)
+        self.tracer.debug('snake', 'Trimmed to {} tiles; snake is "{}"', index, self.snake.word)
 
     def try_add_tile(self, elem):
         self.unhighlight_all()
@@ -1010,7 +885,7 @@ class Game:
             self.trim_snake(elem)
         else:
             if self.snake.length:
-                if self.board.is_neighbor(new_tile=elem, old_tile=self.snake.last):
+                if self.board.topology.is_neighbor((self.snake.last.col, self.snake.last.row), (elem.col, elem.row)):
                     self.add_tile(elem)
                 else:
                     self.snake.empty()
@@ -1064,7 +939,7 @@ class Game:
                 self.execute_event_queue()
             else:
                 self.sfx['submit_invalid'].play()
-                self.print_log(f'Word "{self.snake.word}" not in dictionary')
+                self.tracer.info('snake', 'Word "{}" not in dictionary', self.snake.word)
                 self.mode = 'menu'
                 self.board.create_invalid_word_menu(self.snake.word)
                 self.board.ui_elements += self.board.splash_elements
@@ -1106,8 +981,9 @@ class Game:
         self.save_hi_scores(self.hi_scores)
 
     def unhighlight_all(self):
-        for t in self.tiles:
+        for t in self.highlighted:
             t.unhighlight()
+        self.highlighted = {}
 
     def update_bonus_color(self):
         self.board.update_bonus_color(self.bonus_word, self.snake.word, self.colors)
@@ -1129,25 +1005,23 @@ class Game:
         self.board.score_display.set_text(format(self.score, ',d'))
 
     def update_tile_rows(self):
-        for col in range(7):
-            col_tiles = [t for t in self.tiles if t.col == col]
-            # Check if col needs rearranging
-            if [x for x in col_tiles if x.row < 0]:
-                col_tiles.sort(key=lambda t: t.row)
-                for i in range(8):
-                    try:
-                        # Set row values back to 0-7
-                        col_tiles[i].row = i
-                        col_tiles[i].set_target(from_row_col=True)
-                        col_tiles[i].set_middle()
-                    except IndexError:
-                        # Handle even (7 member) cols
-                        pass
+        moved = self.grid.compact()
+        for tile in moved:
+            tile.set_target(from_row_col=True)
+            tile.set_middle()
+        # Refilled tiles wait above the board, paused, until the queue empties
+        self.animator.fall(moved + [t for t in self.tiles if t.paused])
+        self.animator.beacon(self.grid.with_type('attack'))
 
     def update_tiles(self):
         for tile in [t for t in self.tiles if t.tile_type == 'normal']:
             tile.update(multiplier=self.multiplier)
 
+    def update_words_left(self):
+        words_left = len(self.find_words())
+        self.board.word_display.update(label=f'SELECTED / WORDS LEFT: {words_left}')
+        return words_left
+
     def update_word_display(self):
         text = None
         value = 0
@@ -1155,6 +1029,11 @@ class Game:
         self.board.bonus_display.marquee = False
 
         if self.snake.length:
+            if not self.snake.is_prefix() and not self.god_mode:
+                # No word can be made by extending this snake
+                self.board.word_display.border_color_override = self.colors['red']
+                self.board.word_display.set_text(f'{word} (NO WORDS)')
+                return
             if len(word) > 2:
                 if self.check_dictionary():
                     value = format(self.score_word(word), ',d')
@@ -1,8 +1,9 @@
 import glob, numpy, os, pygame, random, string
+from collections import OrderedDict
 from math import pi
 from time import sleep
 
-import ui
+import hexgrid, rules, ui
 
 class Board():
     def __init__(self, dims, coords, colors):
@@ -18,6 +19,8 @@ class Board():
         }
         self.muted = True
         self.name_entry_pos = 0
+        self.topology = hexgrid.HexTopology(cols=7)
+        self.picker = PickIndex(self.topology)
         self.load_sound_icons()
 
         self.menu_bg = ui.Display(dims=(348, 60), coords=(-2, -2), fonts=self.fonts, colors=colors)
@@ -69,6 +72,7 @@ class Board():
         demo_bg = self.splash_elements[1]
         current_image = [i['surf'] for i in images if i['name'] == f'tut{self.tutorial_current_step}.png'][0]
         demo_bg.surf.blit(current_image, dest=(0, 0))
+        demo_bg.dirty = True
         textbox = self.splash_elements[2]
         # Write 2nd line of text, if it exists
         if self.tutorial_steps_extra[self.tutorial_current_step]:
@@ -306,10 +310,8 @@ class Board():
 
     def create_tiles(self, colors, offset):
         tiles = []
-        # Columns alternate between 7 and 8 rows; first & last are 7s
-        for col in range(7):
-            for row in range(7 + col % 2):
-                tiles.append(ui.Tile(fonts=self.fonts, col=col, row=row, colors=colors, offset=offset))
+        for col, row in self.topology.positions:
+            tiles.append(ui.Tile(fonts=self.fonts, col=col, row=row, colors=colors, offset=offset))
         return tiles
 
     def create_tutorial(self, images):
@@ -403,88 +405,6 @@ class Board():
             elem = None
         self.splash_elements = []
 
-    def is_neighbor(self, new_tile, old_tile):
-
-        '''
-        There are 4 'false' neighbors, depending on which col old_tile
-        is in:
-            Even old_tile.cols:
-                new_c == old_c + 1 and new_r == old_r + 1
-                new_c == old_c - 1 and new_r == old_r + 1
-            Odd old_tile.cols:
-                new_c == old_c - 1 and new_r == old_r - 1
-                new_c == old_c + 1 and new_r == old_r - 1
-        These look good on paper, but looking at the actual arrangement
-        of tiles shows them to be erroneous:
-
-            E C
-            V O           O C
-            E L           D O
-            N             D L
-
-            B B       A A     C C
-        A A B B C C   A A 1 1 C C
-        A A 1 1 C C   0 0 1 1 2 2
-        0 0 1 1 2 2   0 0 X X 2 2
-        0 0 X X 2 2   5 5 X X 3 3
-        5 5 X X 3 3   5 5 4 4 3 3
-        5 5 4 4 3 3   F F 4 4 D D
-        F F 4 4 D D   F F E E D D
-        F F E E D D       E E
-            E E
-
-        'X' = old_tile
-        'D' and 'F' are false neighbors for even column 'X' tiles
-        'A' and 'C' are false neighbors for odd column 'X' tiles
-        '''
-
-        new_c, old_c = new_tile.col, old_tile.col
-        new_r, old_r = new_tile.row, old_tile.row
-
-        # Odd columns
-        if old_tile.col % 2:
-            # 2 o'clock
-            if new_c == old_c + 1 and new_r == old_r - 1:
-                return True
-            # 4 o'clock
-            elif new_c == old_c + 1 and new_r == old_r:
-                return True
-            # 8 o'clock
-            elif new_c == old_c - 1 and new_r == old_r:
-                return True
-            # 10 o'clock
-            elif new_c == old_c - 1 and new_r == old_r - 1:
-                return True
-
-        # Even columns
-        else:
-            # 2 o'clock
-            if new_c == old_c + 1 and new_r == old_r:
-                return True
-            # 4 o'clock
-            elif new_c == old_c + 1 and new_r == old_r + 1:
-                return True
-            # 8 o'clock
-            elif new_c == old_c - 1 and new_r == old_r + 1:
-                return True
-            # 10 o'clock
-            elif new_c == old_c - 1 and new_r == old_r:
-                return True
-
-        # Parity agnostic columns
-        # 12 o'clock
-        if new_c == old_c and new_r == old_r - 1:
-            return True
-        # 6 o'clock
-        elif new_c == old_c and new_r == old_r + 1:
-            return True
-
-        # Self
-        if old_tile  == new_tile:
-            return True
-
-        return False
-
     def load_sound_icons(self):
         self.sound_icons = {}
         dirname = os.path.dirname(__file__)
@@ -494,20 +414,7 @@ class Board():
             self.sound_icons[name] = pygame.image.load(filename)
 
     def lookup_letter_value(self, letter):
-        if letter in 'AEILNORSTU':
-            return 1
-        elif letter in 'DG':
-            return 2
-        elif letter in 'BCMP':
-            return 3
-        elif letter in 'FHVWY':
-            return 4
-        elif letter == 'K':
-            return 5
-        elif letter in 'JX':
-            return 8
-        else:
-            return 10
+        return rules.letter_value(letter)
 
     def toggle_mute(self):
         self.muted = not self.muted
@@ -518,7 +425,8 @@ class Board():
         self.btn_mute.update()
 
     def update_hi_score_display(self, scores):
-        self.hi_score_display.update()
+        # Drawn over the display, so start from a fresh build
+        self.hi_score_display.build_image()
         for n, entry in enumerate(scores):
             color = self.colors['bg_gold'] if entry['current'] else self.colors['light_gray']
             surf = self.fonts['medium'].render(f'{n + 1}. {entry["username"]}', True, color)
@@ -578,34 +486,100 @@ class Board():
         return new_name
 
 class GFXSurf:
+    '''
+    Ghosts, arcs and HP deltas, stored as a struct of numpy arrays (one
+    slot per gfx) so each frame moves and fades all of them at once.
+    Motion is 'rise' (drifts sideways, accelerates upward), 'burst'
+    (flies off in a direction, slowing) or None (stays put). Entries that
+    fade out are compacted away at the end of the frame.
+
+    Blending a surface with its own alpha costs far more per pixel than
+    a plain colorkey blit, unless SDL has run-length encoded it with that
+    alpha. So each gfx is drawn at its fade rounded down to alpha_step,
+    and its surface is re-encoded only when that level changes, every few
+    frames rather than every frame.
+    '''
+    alpha_step = 4
+    arc_size_step = 64
+    fields = ('ax', 'ay', 'fade', 'fade_step', 'level', 'vx', 'vy', 'x', 'y')
+    motions = {None: 0, 'rise': 1, 'burst': 2}
+
     def __init__(self, fonts, colors):
+        self.arc_pool = OrderedDict() # size class -> [surf, ...], spare arc surfaces
+        self.arc_pool_count = 0
+        self.arc_pool_limit = 32 # Spare arc surfaces kept, all sizes together
         self.colors = colors
+        self.count = 0
         self.fonts = fonts
         self.fps = 0
-        self.gfx = []
         self.interactive = False
+        self.pooled = [] # Whether each gfx surf goes back to arc_pool
+        self.surfs = []
+        self.wireframes = ui.SurfaceCache(capacity=128) # (tile look, color) -> wireframe
+        self.reserve(64)
+
+    def add(self, surf, x, y, fade, fade_step, motion, vx=0, vy=0, ax=0, ay=0, pooled=False):
+        if self.count == len(self.x):
+            self.reserve(self.count * 2)
+        i = self.count
+        self.ax[i] = ax
+        self.ay[i] = ay
+        self.fade[i] = fade
+        self.fade_step[i] = fade_step
+        self.level[i] = -1 # Alpha level surf was last encoded at
+        self.motion[i] = self.motions[motion]
+        self.vx[i] = vx
+        self.vy[i] = vy
+        self.x[i] = x
+        self.y[i] = y
+        self.surfs.append(surf)
+        self.pooled.append(pooled)
+        self.count += 1
 
     def blit_gfx(self, window_surface):
+        # Returns the areas drawn over
+        n = self.count
+        if not n:
+            return []
         step = (self.fps / 60)
 
-        for g in self.gfx:
-            g['fade_counter'] = max(0, g['fade_counter'] - g['fade_step'] * step)
-            if g['fade_counter'] > 0:
-                if g['motion'] == 'rise':
-                    g['vx'] += g['vx_accel']
-                    g['vy'] -= g['vy_accel']
-                    g['offset_x'] += g['vx'] * step
-                    g['offset_y'] += g['vy'] * step
-                elif g['motion'] == 'burst':
-                    g['vx'] *= 0.985
-                    g['vy'] -= g['vy_accel']
-                    g['offset_x'] += g['vx'] * step
-                    g['offset_y'] += g['vy'] * step
-                g['surf'].set_alpha(g['fade_counter'])
-                dest = (g['offset_x'], g['offset_y'])
-                window_surface.blit(g['surf'], dest=dest)
-        if not [g for g in self.gfx if g['fade_counter'] > 0]:
-            self.gfx = []
+        fade = self.fade[:n]
+        fade -= self.fade_step[:n] * step
+        numpy.maximum(fade, 0, out=fade)
+        alive = fade > 0
+        motion = self.motion[:n]
+        rise = alive & (motion == self.motions['rise'])
+        burst = alive & (motion == self.motions['burst'])
+        moving = rise | burst
+        self.vx[:n][rise] += self.ax[:n][rise]
+        self.vx[:n][burst] *= 0.985
+        self.vy[:n][moving] -= self.ay[:n][moving]
+        self.x[:n][moving] += self.vx[:n][moving] * step
+        self.y[:n][moving] += self.vy[:n][moving] * step
+
+        if not alive.all():
+            self.compact(alive)
+            n = self.count
+        level = self.fade[:n] // self.alpha_step
+        changed = numpy.flatnonzero(level != self.level[:n])
+        for i, alpha in zip(changed.tolist(), (level[changed] * self.alpha_step).tolist()):
+            self.surfs[i].set_alpha(alpha, pygame.RLEACCEL)
+        self.level[:n] = level
+        return window_surface.blits(zip(self.surfs, zip(self.x[:n].tolist(), self.y[:n].tolist())))
+
+    def compact(self, alive):
+        # Drops faded gfx, keeping the rest in order
+        keep = numpy.flatnonzero(alive)
+        n = len(keep)
+        for name in self.fields + ('motion',):
+            array = getattr(self, name)
+            array[:n] = array[keep]
+        for surf, pooled, live in zip(self.surfs, self.pooled, alive.tolist()):
+            if pooled and not live:
+                self.release_arc_surf(surf)
+        self.surfs = [self.surfs[i] for i in keep.tolist()]
+        self.pooled = [self.pooled[i] for i in keep.tolist()]
+        self.count = n
 
     def create_delta(self, amt, offset_x):
         if type(amt) == str:
@@ -622,32 +596,13 @@ class GFXSurf:
                 prefix = '+'
                 offset_x += 10
             surf = self.fonts['large'].render(prefix + str(amt), True, color)
-        delta = {
-            'dims': surf.get_size(),
-            'fade_counter': 255 + random.choice(range(50)),
-            'fade_step': 1.5,
-            'offset_x': offset_x - (surf.get_size()[0] / 2),
-            'offset_y': 130 - surf.get_size()[1],
-            'motion': 'rise',
-            'surf': surf,
-            'vx': 0,
-            'vx_accel': 0,
-            'vy': 0,
-            'vy_accel': 0.001
-        }
-
-        self.gfx.append(delta)
+        x = offset_x - (surf.get_size()[0] / 2)
+        y = 130 - surf.get_size()[1]
+        self.add(surf, x, y, fade=255 + random.choice(range(50)), fade_step=1.5, motion='rise', ay=0.001)
 
     def create_ghost(self, tile, ghost_color, motion='rise', direction=None):
-        surf = pygame.Surface(tile.dims)
-        surfarray = pygame.surfarray.array2d(tile.surf)
-        transparent_c = surf.map_rgb(self.colors['transparent'])
-        wireframe = numpy.full_like(surfarray, transparent_c)
-        bg_c = surf.map_rgb(tile.bg_color)
-        wireframe_c = surf.map_rgb(ghost_color)
-        wireframe = numpy.array([[transparent_c if c == bg_c else wireframe_c for c in row] for row in surfarray])
-        pygame.surfarray.blit_array(surf, wireframe)
-        surf.set_colorkey(self.colors['transparent'])
+        # Each ghost fades on its own, so gets its own copy
+        surf = self.wireframes.get((tile.look, tuple(ghost_color)), lambda: self.render_wireframe(tile, ghost_color)).copy()
         vx = 0
         vy = 0
         amt = .6
@@ -668,19 +623,10 @@ class GFXSurf:
             elif direction == 'nw':
                 vx = -amt + (random.choice(range(5)) - 2) / 100
                 vy = -amt + (random.choice(range(5)) - 2) / 100
-        ghost = {
-            'fade_counter': 200 + random.choice(range(155)),
-            'fade_step': 3,
-            'offset_x': tile.coords[0],
-            'offset_y': tile.coords[1],
-            'motion': motion,
-            'surf': surf,
-            'vx': vx,
-            'vx_accel': (random.choice(range(3)) - 1) / 100,
-            'vy': vy,
-            'vy_accel': 0.03 + ((random.choice(range(5)) - 2) / 100)
-        }
-        self.gfx.append(ghost)
+        fade = 200 + random.choice(range(155))
+        ax = (random.choice(range(3)) - 1) / 100
+        ay = 0.03 + ((random.choice(range(5)) - 2) / 100)
+        self.add(surf, tile.coords[0], tile.coords[1], fade=fade, fade_step=3, motion=motion, vx=vx, vy=vy, ax=ax, ay=ay)
 
     def draw_arcs(self, arc_sources):
         for source in arc_sources:
@@ -703,26 +649,142 @@ class GFXSurf:
                 stop_angle = pi/2
             color = self.colors[source[1]]
 
-            surf = pygame.Surface((700, 700))
-            surf.fill(self.colors['transparent'])
-            surf.set_colorkey(self.colors['transparent'])
-            arc = {
-                'fade_counter': 255 + random.choice(range(100)),
-                'fade_step': 2,
-                'offset_x': 0,
-                'offset_y': 0,
-                'motion': None,
-                'surf': surf,
-                'vx': 0,
-                'vx_accel': 0,
-                'vy': 0,
-                'vy_accel': 0
-            }
-            pygame.draw.arc(surf, color, pygame.Rect(left, top, width, height), start_angle, stop_angle, width=3)
-            self.gfx.append(arc)
+            # Only the upper left or upper right quarter of the ellipse
+            # is drawn, so size the surface to that quarter
+            rect = pygame.Rect(left, top, width, height)
+            half_w = rect.width // 2
+            if start_angle:
+                area = pygame.Rect(rect.left, rect.top, half_w + 2, rect.height // 2 + 2)
+            else:
+                area = pygame.Rect(rect.left + half_w - 1, rect.top, rect.width - half_w + 1, rect.height // 2 + 2)
+            surf = self.get_arc_surf(area.size)
+            # Clipped as a surface of exactly area's size would be; the
+            # clip has to go again before SDL encodes the surface
+            surf.set_clip(pygame.Rect((0, 0), area.size))
+            pygame.draw.arc(surf, color, rect.move(-area.left, -area.top), start_angle, stop_angle, width=3)
+            surf.set_clip(None)
+            self.add(surf, area.left, area.top, fade=255 + random.choice(range(100)), fade_step=2, motion=None, pooled=True)
 
             self.create_delta(amt=source[2], offset_x=arc_end[0])
 
+    def get_arc_surf(self, size):
+        # Arcs come in all sizes, so surfaces are made and pooled at the
+        # size rounded up to a multiple of arc_size_step; arcs of similar
+        # size share them, and the margin is left transparent
+        step = self.arc_size_step
+        size_class = tuple(-(-n // step) * step for n in size)
+        pool = self.arc_pool.get(size_class)
+        if pool:
+            surf = pool.pop()
+            self.arc_pool_count -= 1
+            if not pool:
+                del self.arc_pool[size_class]
+            # Filling a surface still run-length encoded at its old alpha
+            # leaves stale pixels behind
+            surf.set_alpha(None)
+        else:
+            surf = pygame.Surface(size_class)
+        surf.fill(self.colors['transparent'])
+        surf.set_colorkey(self.colors['transparent'])
+        return surf
+
+    def release_arc_surf(self, surf):
+        # Past arc_pool_limit, the spare of the least recently released
+        # size class makes way
+        size_class = surf.get_size()
+        self.arc_pool.setdefault(size_class, []).append(surf)
+        self.arc_pool.move_to_end(size_class)
+        self.arc_pool_count += 1
+        if self.arc_pool_count > self.arc_pool_limit:
+            oldest, pool = next(iter(self.arc_pool.items()))
+            pool.pop(0)
+            self.arc_pool_count -= 1
+            if not pool:
+                del self.arc_pool[oldest]
+
+    def reserve(self, capacity):
+        # Grows the gfx arrays to hold capacity entries
+        for name in self.fields:
+            array = numpy.zeros(capacity)
+            if hasattr(self, name):
+                array[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, array)
+        motion = numpy.zeros(capacity, dtype=numpy.int8)
+        if hasattr(self, 'motion'):
+            motion[:self.count] = self.motion[:self.count]
+        self.motion = motion
+
+    def render_wireframe(self, tile, ghost_color):
+        # Everything but the tile's background, in ghost_color
+        surf = pygame.Surface(tile.dims)
+        surfarray = pygame.surfarray.array2d(tile.surf)
+        transparent_c = surf.map_rgb(self.colors['transparent'])
+        bg_c = surf.map_rgb(tile.bg_color)
+        wireframe_c = surf.map_rgb(ghost_color)
+        wireframe = numpy.where(surfarray == bg_c, transparent_c, wireframe_c)
+        pygame.surfarray.blit_array(surf, wireframe)
+        surf.set_colorkey(self.colors['transparent'])
+        return surf
+
+class PickIndex:
+    '''
+    Finds the interactive element under the mouse. Tiles are found from
+    the board geometry: the cell under the mouse gives a (col, row) to
+    look up in the grid, and a falling tile is searched for in its column
+    only. Everything else is hit-tested against rects indexed once per
+    element list, so the index is rebuilt only when a menu opens or
+    closes.
+    '''
+    def __init__(self, topology):
+        self.count = 0
+        self.elements = None
+        self.grid = None
+        self.origin = (0, 0) # Top left of the odd columns
+        self.rects = []      # [(rect, elem), ...] for interactive non-tiles
+        self.size = 48
+        self.topology = topology
+
+    def build(self, elements):
+        self.count = len(elements)
+        self.elements = elements
+        self.grid = None
+        self.rects = []
+        for elem in elements:
+            if not elem.interactive:
+                continue
+            if isinstance(elem, ui.Tile):
+                if not self.grid:
+                    self.grid = elem.grid
+                    self.origin = (elem.offset[0], elem.offset[1] - (0 if elem.col % 2 else elem.dims[1] / 2))
+                    self.size = elem.dims[0]
+            else:
+                self.rects.append((elem.get_abs_rect(), elem))
+
+    def elem_at(self, pos, elements):
+        if elements is not self.elements or len(elements) != self.count:
+            self.build(elements)
+        if self.grid:
+            tile = self.tile_at(pos)
+            if tile:
+                return tile
+        for rect, elem in self.rects:
+            if rect.collidepoint(pos):
+                return elem
+        return None
+
+    def tile_at(self, pos):
+        cell = self.topology.locate(pos[0] - self.origin[0], pos[1] - self.origin[1], self.size)
+        if not cell:
+            return None
+        tile = self.grid.at(*cell)
+        if tile and tile.coords == tile.target:
+            return tile
+        # Something in this column is still falling
+        for tile in self.grid.columns[cell[0]]:
+            if tile.get_abs_rect().collidepoint(pos):
+                return tile
+        return None
+
 def offset_from_element(element, corner, offset):
     point = [element.coords[i] + element.surf.get_size()[i] if corner[i] else element.coords[i] for i in range(len(corner))]
     return tuple([point[i] + offset[i] for i in range(len(point))])
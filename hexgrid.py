@@ -0,0 +1,150 @@
+class HexTopology:
+    '''
+    Neighbor table for a board shape, built once. Columns alternate between
+    7 and 8 rows (first & last are 7s), and the 8-row odd columns sit half
+    a tile higher than their even neighbors. That makes the side neighbors
+    of a tile depend on its column's parity:
+
+            E C
+            V O           O C
+            E L           D O
+            N             D L
+
+            B B       A A     C C
+        A A B B C C   A A 1 1 C C
+        A A 1 1 C C   0 0 1 1 2 2
+        0 0 1 1 2 2   0 0 X X 2 2
+        0 0 X X 2 2   5 5 X X 3 3
+        5 5 X X 3 3   5 5 4 4 3 3
+        5 5 4 4 3 3   F F 4 4 D D
+        F F 4 4 D D   F F E E D D
+        F F E E D D       E E
+            E E
+
+        'X' = tile; 0-5 = its neighbors, clockwise from 10 o'clock
+        'D' and 'F' are not neighbors of even column 'X' tiles
+        'A' and 'C' are not neighbors of odd column 'X' tiles
+
+    Positions are (col, row) tuples; directions are the compass point of
+    a neighbor as seen from the tile.
+    '''
+    def __init__(self, cols=7):
+        self.cols = cols
+        self.positions = [(col, row) for col in range(cols) for row in range(self.rows(col))]
+        self.directions = {} # (pos, neighbor) -> compass direction
+        self.neighbors = {}  # pos -> [neighbor, ...], in board order
+
+        on_board = set(self.positions)
+        for col, row in self.positions:
+            if col % 2:
+                offsets = {'n': (0, -1), 'ne': (1, -1), 'se': (1, 0), 's': (0, 1), 'sw': (-1, 0), 'nw': (-1, -1)}
+            else:
+                offsets = {'n': (0, -1), 'ne': (1, 0), 'se': (1, 1), 's': (0, 1), 'sw': (-1, 1), 'nw': (-1, 0)}
+            neighbors = []
+            for direction, (dc, dr) in offsets.items():
+                pos = (col + dc, row + dr)
+                if pos in on_board:
+                    neighbors.append(pos)
+                    self.directions[((col, row), pos)] = direction
+            self.neighbors[(col, row)] = sorted(neighbors)
+
+    def direction(self, pos, neighbor):
+        return self.directions[(pos, neighbor)]
+
+    def is_neighbor(self, pos, other):
+        return (pos, other) in self.directions
+
+    def locate(self, x, y, size):
+        '''
+        Position of the cell containing pixel (x, y), measured from the
+        top left of the odd columns, for size x size tiles. Returns None
+        off the board.
+        '''
+        col = int(x // size)
+        if not 0 <= col < self.cols:
+            return None
+        if not col % 2:
+            y -= size / 2
+        row = int(y // size)
+        if not 0 <= row < self.rows(col):
+            return None
+        return (col, row)
+
+    def rows(self, col):
+        return 7 + col % 2
+
+class TileGrid:
+    '''
+    Owns the board's tiles and keeps four views of them consistent:
+    per-column lists in row order, a (col, row) -> tile map, a
+    letter -> tiles index and a tile type -> tiles index. Tiles report
+    their own letter and type changes through relabel() and retype().
+    Removed tiles leave the position map straight away and are stacked
+    above their column until compact() lets the column fall.
+    '''
+    def __init__(self, topology, tiles):
+        self.topology = topology
+        self.tiles = tiles
+        self.columns = [[] for _ in range(topology.cols)]
+        self.dirty_cols = set()
+        self.letters = {}   # letter -> {tile: None}, in insertion order
+        self.positions = {} # (col, row) -> tile, on-board tiles only
+        self.removed = [[] for _ in range(topology.cols)]
+        self.types = {}     # tile type -> {tile: None}, in insertion order
+
+        for tile in tiles:
+            self.columns[tile.col].append(tile)
+            self.positions[(tile.col, tile.row)] = tile
+            self.letters.setdefault(tile.letter, {})[tile] = None
+            self.types.setdefault(tile.tile_type, {})[tile] = None
+            tile.grid = self
+        for column in self.columns:
+            column.sort(key=lambda t: t.row)
+
+    def at(self, col, row):
+        return self.positions.get((col, row))
+
+    def compact(self):
+        '''
+        Drops the tiles of every column with removed tiles into rows 0-n,
+        removed tiles on top (last removed highest). Returns the tiles
+        whose row changed.
+        '''
+        moved = []
+        for col in sorted(self.dirty_cols):
+            on_board = [t for t in self.columns[col] if t not in self.removed[col]]
+            column = list(reversed(self.removed[col])) + on_board
+            for row, tile in enumerate(column):
+                if tile.row != row:
+                    tile.row = row
+                    moved.append(tile)
+                self.positions[(col, row)] = tile
+            self.columns[col] = column
+            self.removed[col] = []
+        self.dirty_cols = set()
+        return moved
+
+    def relabel(self, tile, old_letter):
+        if old_letter in self.letters:
+            self.letters[old_letter].pop(tile, None)
+        self.letters.setdefault(tile.letter, {})[tile] = None
+
+    def remove(self, tile):
+        if tile in self.removed[tile.col]:
+            return
+        del self.positions[(tile.col, tile.row)]
+        self.removed[tile.col].append(tile)
+        # Park above the column at rows -1, -2, ...
+        tile.row = -len(self.removed[tile.col])
+        self.dirty_cols.add(tile.col)
+
+    def retype(self, tile, old_type):
+        if old_type in self.types:
+            self.types[old_type].pop(tile, None)
+        self.types.setdefault(tile.tile_type, {})[tile] = None
+
+    def with_letter(self, letter):
+        return list(self.letters.get(letter, ()))
+
+    def with_type(self, tile_type):
+        return list(self.types.get(tile_type, ()))
@@ -0,0 +1,328 @@
+'''
+Compiled dictionary artifact. compendium.txt is compiled once into a flat
+binary file that is mmap'd read-only at startup, so there is nothing to
+parse on a cold start and several game processes share the same pages.
+
+Layout (native byte order, every section 8-byte aligned):
+    header      see HEADER below
+    offsets     uint32[words + 1]  start of each word in the blob
+    rarities    float64[words]
+    table       uint32[table_size] open-addressed hash table of word
+                index + 1 (0 = empty slot), keyed on crc32
+    first_edge  uint32[nodes + 1]  trie edges of node n are
+                first_edge[n]:first_edge[n + 1]
+    targets     uint32[edges]
+    node_words  int32[nodes]       word index if node ends a word, else -1
+    length_starts
+                uint32[lengths + 1] words of length n are
+                length_ids[length_starts[n]:length_starts[n + 1]]
+    length_ids  uint32[words]      word indices by length, then rarity
+    heights     uint8[nodes]       bytes in the longest word below node
+    labels      uint8[edges]       edge bytes of the UTF-8 words, sorted
+                                   per node
+    blob        uint8[blob_size]   sorted words, concatenated
+'''
+
+import hashlib, mmap, os, random, struct, zlib
+from array import array
+
+ARTIFACT_VERSION = 4
+HEADER = struct.Struct('=8sIIQq20sIIIIII')
+MAGIC = b'SNEKLEX\x00'
+BYTE_ORDER = 0x01020304
+BYTES = [bytes((i,)) for i in range(256)]
+
+class Lexicon:
+    def __init__(self, buffer):
+        self.buffer = buffer
+        header = HEADER.unpack_from(buffer, 0)
+        self.word_count = header[6]
+        sections = layout(*header[6:])
+        view = memoryview(buffer)
+        for name, typecode, start, length in sections:
+            if typecode == 'B':
+                setattr(self, name, view[start:start + length])
+            else:
+                setattr(self, name, view[start:start + length * array(typecode).itemsize].cast(typecode))
+            if name == 'labels':
+                self.labels_start = start
+        self._automaton = None
+        self._length_index = None
+
+    def __contains__(self, word):
+        return self.index(word) >= 0
+
+    def __iter__(self):
+        for i in range(self.word_count):
+            yield self.word(i)
+
+    def __len__(self):
+        return self.word_count
+
+    @property
+    def automaton(self):
+        if self._automaton is None:
+            self._automaton = MappedAutomaton(self)
+        return self._automaton
+
+    def index(self, word):
+        key = word.encode()
+        mask = len(self.table) - 1
+        slot = zlib.crc32(key) & mask
+        while self.table[slot]:
+            i = self.table[slot] - 1
+            if self.blob[self.offsets[i]:self.offsets[i + 1]] == key:
+                return i
+            slot = (slot + 1) & mask
+        return -1
+
+    def items(self):
+        for i in range(self.word_count):
+            yield self.word(i), self.rarities[i]
+
+    @property
+    def length_index(self):
+        if self._length_index is None:
+            self._length_index = LengthIndex(self.length_starts, self.length_ids, self.rarities.__getitem__, self.word)
+        return self._length_index
+
+    def rarity(self, word):
+        i = self.index(word)
+        return self.rarities[i] if i >= 0 else None
+
+    def word(self, i):
+        return bytes(self.blob[self.offsets[i]:self.offsets[i + 1]]).decode()
+
+class LengthIndex:
+    '''
+    Words bucketed by length, each bucket sorted by rarity, so "words of
+    length N rarer than R" is a single bisect. Works in place on two
+    sections of a compiled artifact: bucket N holds the word ids
+    ids[starts[N]:starts[N + 1]]. rarity(i) and word(i) look a word id
+    up in the same artifact.
+    '''
+    def __init__(self, starts, ids, rarity, word):
+        self.ids = ids
+        self.rarity = rarity
+        self.starts = starts
+        self.word = word
+
+    def bisect(self, length, rarity):
+        # (first id rarer than rarity, end of bucket) positions in ids
+        if not 0 <= length < len(self.starts) - 1:
+            return 0, 0
+        lo, hi = self.starts[length], self.starts[length + 1]
+        end = hi
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if rarity < self.rarity(self.ids[mid]):
+                hi = mid
+            else:
+                lo = mid + 1
+        return lo, end
+
+    def choose_above(self, length, rarity):
+        start, end = self.bisect(length, rarity)
+        if start == end:
+            raise IndexError(f'No words of length {length} with rarity above {rarity}')
+        return self.word(self.ids[random.randrange(start, end)])
+
+    def count_above(self, length, rarity):
+        start, end = self.bisect(length, rarity)
+        return end - start
+
+    def words_above(self, length, rarity):
+        start, end = self.bisect(length, rarity)
+        return [self.word(i) for i in self.ids[start:end]]
+
+class MappedAutomaton:
+    '''
+    Prefix automaton over the compiled trie. States are node indices; None
+    is the dead state (no word starts with the letters consumed so far).
+    'Qu' tiles are fed in as two characters.
+    '''
+    start = 0
+
+    def __init__(self, lex):
+        self.buffer = lex.buffer
+        self.first_edge = lex.first_edge
+        self.heights = lex.heights
+        self.labels_start = lex.labels_start
+        self.node_words = lex.node_words
+        self.targets = lex.targets
+
+    def height(self, state):
+        # How many more letters the longest word through state needs
+        return self.heights[state]
+
+    def is_word(self, state):
+        return state is not None and self.node_words[state] >= 0
+
+    def step(self, state, chars):
+        for byte in chars.encode():
+            if state is None:
+                return None
+            base = self.labels_start
+            i = self.buffer.find(BYTES[byte], base + self.first_edge[state], base + self.first_edge[state + 1])
+            state = self.targets[i - base] if i >= 0 else None
+        return state
+
+class PrefixAutomaton:
+    # Pointer-based trie over UTF-8 bytes; only used while compiling the
+    # artifact
+    def __init__(self, keys):
+        self.children = [{}]
+        self.terminal = [-1]
+        for n, key in enumerate(keys):
+            state = 0
+            for byte in key:
+                next_state = self.children[state].get(byte)
+                if next_state is None:
+                    next_state = len(self.children)
+                    self.children[state][byte] = next_state
+                    self.children.append({})
+                    self.terminal.append(-1)
+                state = next_state
+            self.terminal[state] = n
+
+def align(n):
+    return (n + 7) & ~7
+
+def compile_lexicon(entries, source_stamp):
+    entries = sorted(entries)
+    words = [w for w, _ in entries]
+    encoded = [w.encode() for w in words]
+
+    offsets = array('I', [0])
+    for key in encoded:
+        offsets.append(offsets[-1] + len(key))
+    rarities = array('d', [r for _, r in entries])
+
+    table_size = 1
+    while table_size < len(words) * 2:
+        table_size *= 2
+    table = array('I', bytes(4 * table_size))
+    mask = table_size - 1
+    for i, key in enumerate(encoded):
+        slot = zlib.crc32(key) & mask
+        while table[slot]:
+            slot = (slot + 1) & mask
+        table[slot] = i + 1
+
+    trie = PrefixAutomaton(encoded)
+    first_edge = array('I', [0])
+    targets = array('I')
+    labels = bytearray()
+    for children in trie.children:
+        for byte in sorted(children):
+            labels.append(byte)
+            targets.append(children[byte])
+        first_edge.append(len(targets))
+    node_words = array('i', trie.terminal)
+    # Children are always created after their parent
+    heights = bytearray(len(trie.children))
+    for n in range(len(trie.children) - 1, -1, -1):
+        heights[n] = min(max((heights[c] + 1 for c in trie.children[n].values()), default=0), 255)
+
+    length_starts, length_ids = length_buckets([len(w) for w in words], rarities)
+
+    blob = b''.join(encoded)
+    counts = (len(words), len(trie.children), len(targets), table_size, len(blob), len(length_starts) - 1)
+    size, mtime_ns, digest = source_stamp
+    out = bytearray(HEADER.pack(MAGIC, ARTIFACT_VERSION, BYTE_ORDER, size, mtime_ns, digest, *counts))
+    sections = (offsets, rarities, table, first_edge, targets, node_words, length_starts, length_ids, bytes(heights), bytes(labels), blob)
+    for (_, _, start, _), data in zip(layout(*counts), sections):
+        out += bytes(start - len(out))
+        out += data if isinstance(data, bytes) else data.tobytes()
+    return bytes(out)
+
+def length_buckets(lengths, rarities):
+    '''
+    The length_starts and length_ids sections for words with the given
+    lengths and rarities, in word index order. Ties in rarity keep index
+    order.
+    '''
+    ids = sorted(range(len(lengths)), key=lambda i: (lengths[i], rarities[i]))
+    counts = [0] * (max(lengths, default=-1) + 1)
+    for length in lengths:
+        counts[length] += 1
+    starts = array('I', [0])
+    for count in counts:
+        starts.append(starts[-1] + count)
+    return starts, array('I', ids)
+
+def layout(word_count, node_count, edge_count, table_size, blob_size, length_count):
+    sections = []
+    pos = align(HEADER.size)
+    for name, typecode, length in (
+        ('offsets', 'I', word_count + 1),
+        ('rarities', 'd', word_count),
+        ('table', 'I', table_size),
+        ('first_edge', 'I', node_count + 1),
+        ('targets', 'I', edge_count),
+        ('node_words', 'i', node_count),
+        ('length_starts', 'I', length_count + 1),
+        ('length_ids', 'I', word_count),
+        ('heights', 'B', node_count),
+        ('labels', 'B', edge_count),
+        ('blob', 'B', blob_size)
+    ):
+        sections.append((name, typecode, pos, length))
+        pos = align(pos + length * array(typecode).itemsize)
+    return sections
+
+def load(source_path, artifact_path=None):
+    '''
+    Returns a Lexicon for source_path, recompiling the artifact when the
+    source's size/mtime (or, failing that, its sha1) no longer match.
+    '''
+    if artifact_path is None:
+        artifact_path = os.path.splitext(source_path)[0] + '.lex'
+    stat = os.stat(source_path)
+    buffer = map_artifact(artifact_path)
+    if buffer is not None:
+        header = HEADER.unpack_from(buffer, 0)
+        if header[3:5] == (stat.st_size, stat.st_mtime_ns):
+            return Lexicon(buffer)
+
+    with open(source_path, 'rb') as file:
+        source = file.read()
+    digest = hashlib.sha1(source).digest()
+    if buffer is not None and HEADER.unpack_from(buffer, 0)[5] == digest:
+        # Source was touched but not changed
+        return Lexicon(buffer)
+
+    data = compile_lexicon(parse_compendium(source.decode()), (stat.st_size, stat.st_mtime_ns, digest))
+    try:
+        tmp_path = f'{artifact_path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as file:
+            file.write(data)
+        os.replace(tmp_path, artifact_path)
+    except OSError:
+        # Read-only install; fall back to the in-memory copy
+        return Lexicon(data)
+    return Lexicon(map_artifact(artifact_path))
+
+def map_artifact(path):
+    try:
+        with open(path, 'rb') as file:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    if len(buffer) < HEADER.size:
+        return None
+    header = HEADER.unpack_from(buffer, 0)
+    if header[:3] != (MAGIC, ARTIFACT_VERSION, BYTE_ORDER):
+        return None
+    name, typecode, start, length = layout(*header[6:])[-1]
+    if len(buffer) < start + length:
+        return None
+    return buffer
+
+def parse_compendium(text):
+    for line in text.split('\n'):
+        if not line:
+            continue
+        x = line.split(',')
+        # Plain word lists without a rarity column are allowed
+        yield x[0], float(x[1]) if len(x) > 1 else 0.0
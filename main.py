@@ -1,41 +1,55 @@
-import glob, os, pygame, sys
+import glob, os, pygame, sys, traceback
 
-import game_logic
+import dawg, framerate, game_logic, lexicon, pointer, renderer, tracing
 from ui import Tile, HPDisplay
 
-def get_elem_under_mouse(game, mode):
-    mouse_pos = pygame.mouse.get_pos()
+def get_elem_under_mouse(game, mode, pos=None):
     if mode == 'play':
         all_elements = game.board.ui_elements
     else:
         all_elements = game.board.splash_elements
-    for obj in [e for e in all_elements if e.interactive]:
-        if obj.get_abs_rect().collidepoint(mouse_pos):
-            return obj
-    return None
+    return game.board.picker.elem_at(pos or pygame.mouse.get_pos(), all_elements)
 
-def load_dictionary():
-    words = []
+def handle_motion(game, path, mouse_mode):
+    # Hover goes by where the mouse ended up; a drag takes every tile on the way
+    elem = get_elem_under_mouse(game, game.mode, path[-1])
+    game.try_mouse_over(game.mode, elem)
+    if game.mode == 'play':
+        if mouse_mode == 'drag':
+            crossed = []
+            for pos in path:
+                elem = get_elem_under_mouse(game, game.mode, pos)
+                if not crossed or elem is not crossed[-1]:
+                    crossed.append(elem)
+            for elem in crossed:
+                game.try_add_tile(elem)
+            game.update_word_display()
+            game.highlight_selected_tiles()
+        game.update_btn_clear_marked()
 
+def load_dictionary(filepath=None):
+    if not filepath:
+        filepath = os.path.dirname(__file__) + '/compendium.txt'
     try:
-        filepath = os.path.dirname(__file__)
-        with open(filepath + '/compendium.txt') as file:
-            for line in file.read().split('\n'):
-                x = line.split(',')
-                words.append([x[0], float(x[1])])
+        if filepath.endswith('.dawg'):
+            words = dawg.load(filepath)
+        else:
+            words = lexicon.load(filepath)
     except FileNotFoundError:
-        raise SystemExit('Error: Dictionary file not found\nExpexted file at "compendium.txt"')
+        raise SystemExit(f'Error: Dictionary file not found\nExpexted file at "{filepath}"')
+    except ValueError:
+        raise SystemExit(f'Error: Dictionary file at "{filepath}" is empty or unreadable')
     if not words:
-        raise SystemExit('Error: Dictionary file at "compendium.txt" is empty or unreadable')
+        raise SystemExit(f'Error: Dictionary file at "{filepath}" is empty or unreadable')
 
     return words
 
-def main(debug):
+def main(debug, dictionary_path=None):
     dims = (676, 608)
     pygame.init()
     pygame.display.set_caption('Booksnek')
     window_surface = pygame.display.set_mode(dims)
-    game = game_logic.Game(dims=dims, dictionary=load_dictionary(), debug=debug)
+    game = game_logic.Game(dims=dims, dictionary=load_dictionary(dictionary_path), debug=debug)
 
     mouse_down = pygame.MOUSEBUTTONDOWN
     mouse_up = pygame.MOUSEBUTTONUP
@@ -46,14 +60,23 @@ def main(debug):
     right_clicked_elem = None
     begin_submit = False
     mouse_mode = 'click'
-    clock = pygame.time.Clock()
+    motion = pointer.MotionPath()
+    governor = framerate.FrameGovernor(fps=60)
     is_running = True
+    screen = renderer.Renderer(window_surface, game.board.background)
 
     while is_running:
-        clock.tick(60)
-        game.board.gfx.fps = clock.get_fps()
+        dt = governor.tick(game.is_idle())
+        game.board.gfx.fps = governor.measured_fps
+        game.scheduler.update(dt)
 
-        for event in pygame.event.get():
+        for event in governor.events():
+            if event.type == mouse_motion:
+                motion.add(event.pos)
+                continue
+            if motion:
+                # Catch up on the mouse before anything that depends on it
+                handle_motion(game, motion.flush(), mouse_mode)
             if event.type == pygame.QUIT:
                 is_running = False
             elif event.type == mouse_down:
@@ -97,14 +120,6 @@ def main(debug):
                 elif event.__dict__['button'] == mouse_right:
                     if game.mode == 'play':
                         game.toggle_mark(elem, right_clicked_elem)
-            elif event.type == mouse_motion:
-                elem = get_elem_under_mouse(game, game.mode)
-                game.try_mouse_over(game.mode, elem)
-                if game.mode == 'play':
-                    if mouse_mode == 'drag':
-                        game.try_add_tile(elem)
-                        game.update_word_display()
-                        game.highlight_selected_tiles()
             elif event.type == pygame.KEYDOWN:
                 if game.mode == 'play':
                     if not game.input_disabled:
@@ -113,16 +128,28 @@ def main(debug):
                     game.handle_name_entry(event.key)
             if game.mode == 'play':
                 game.update_btn_clear_marked()
+        if motion:
+            handle_motion(game, motion.flush(), mouse_mode)
         game.animate()
-        window_surface.blit(game.board.background, (0, 0))
-        for element in game.board.ui_elements:
-            window_surface.blit(element.surf, element.coords)
-        game.board.gfx.blit_gfx(window_surface)
-        pygame.display.update()
+        screen.draw(game.board.ui_elements, game.board.gfx)
 
 if __name__ == '__main__':
     debug = False
-    if len(sys.argv) == 2:
-        if sys.argv[1] == 'debug':
+    dictionary_path = None
+    # python main.py [debug[=category,...]] [dictionary file (.txt or .dawg)]
+    for arg in sys.argv[1:]:
+        if arg == 'debug':
             debug = True
-    main(debug)
+        elif arg.startswith('debug='):
+            debug = True
+            tracing.tracer.configure(categories=arg.split('=', 1)[1].split(','))
+        else:
+            dictionary_path = arg
+    try:
+        main(debug, dictionary_path)
+    except Exception:
+        # Keep the trail leading up to the crash
+        tracing.tracer.error('crash', '{}', traceback.format_exc)
+        path = tracing.tracer.dump(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'crash_trace.log'))
+        print(f'Trace written to {path}', file=sys.stderr)
+        raise
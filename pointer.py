@@ -0,0 +1,36 @@
+from math import ceil
+
+class MotionPath:
+    '''
+    Collects the positions of a frame's MOUSEMOTION events so the game
+    can handle them once per frame instead of once per event. flush()
+    joins them into a path from wherever the last flush ended, sampled
+    at most step pixels apart, so a fast drag still passes over every
+    tile it crossed.
+    '''
+    def __init__(self, step=8):
+        self.last = None   # End of the last flushed path
+        self.pending = []  # Positions since then, oldest first
+        self.step = step
+
+    def __bool__(self):
+        return bool(self.pending)
+
+    def add(self, pos):
+        self.pending.append(pos)
+
+    def flush(self):
+        if not self.pending:
+            return []
+        start = self.last or self.pending[0]
+        path = []
+        for end in self.pending:
+            dx = end[0] - start[0]
+            dy = end[1] - start[1]
+            samples = max(1, ceil(max(abs(dx), abs(dy)) / self.step))
+            for i in range(1, samples + 1):
+                path.append((start[0] + round(dx * i / samples), start[1] + round(dy * i / samples)))
+            start = end
+        self.last = start
+        self.pending = []
+        return path
@@ -0,0 +1,56 @@
+import pygame
+
+class Renderer:
+    '''
+    Draws the board into the window, redrawing only what changed since the
+    last frame. An element is redrawn when it is dirty (its surf was
+    rebuilt) or it moved; gfx are redrawn every frame, and whatever they
+    covered last frame is restored from the background and elements
+    underneath. Any change to the element list itself (a menu opening or
+    closing) redraws the whole window.
+    '''
+    def __init__(self, window, background):
+        self.background = background
+        self.drawn = {}     # element -> rect it was last drawn at
+        self.elements = []
+        self.gfx_rects = [] # areas covered by last frame's gfx
+        self.window = window
+
+    def draw(self, elements, gfx):
+        if elements != self.elements:
+            self.redraw(elements, gfx)
+            return
+
+        damaged = self.gfx_rects
+        for elem in elements:
+            rect = pygame.Rect(elem.coords, elem.surf.get_size())
+            old_rect = self.drawn[elem]
+            if elem.dirty or rect != old_rect:
+                damaged.append(old_rect)
+                damaged.append(rect)
+                self.drawn[elem] = rect
+                elem.dirty = False
+
+        window = self.window
+        for area in damaged:
+            window.set_clip(area)
+            window.blit(self.background, area, area)
+            for elem in elements:
+                if self.drawn[elem].colliderect(area):
+                    window.blit(elem.surf, elem.coords)
+        window.set_clip(None)
+
+        self.gfx_rects = gfx.blit_gfx(window)
+        pygame.display.update(damaged + self.gfx_rects)
+
+    def redraw(self, elements, gfx):
+        window = self.window
+        window.blit(self.background, (0, 0))
+        self.drawn = {}
+        for elem in elements:
+            window.blit(elem.surf, elem.coords)
+            self.drawn[elem] = pygame.Rect(elem.coords, elem.surf.get_size())
+            elem.dirty = False
+        self.elements = list(elements)
+        self.gfx_rects = gfx.blit_gfx(window)
+        pygame.display.update()
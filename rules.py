@@ -0,0 +1,263 @@
+'''
+Turn rules with no pygame in them. resolve_turn() takes a snapshot of the
+board and the positions of a submitted word and returns the board after
+the turn together with the events that got it there, so bots and
+simulations can play without a display. The UI only needs the events,
+which it replays as animation, so it calls play_turn() on a view of its
+own tiles instead.
+
+Event precedences and their effects are described in logic.txt.
+'''
+
+import random
+
+import events
+
+LETTER_WEIGHTS = {
+    'A': 0.09,
+    'B': 0.02,
+    'C': 0.02,
+    'D': 0.04,
+    'E': 0.12,
+    'F': 0.02,
+    'G': 0.03,
+    'H': 0.02,
+    'I': 0.09,
+    'J': 0.01,
+    'K': 0.01,
+    'L': 0.04,
+    'M': 0.03,
+    'N': 0.06,
+    'O': 0.08,
+    'P': 0.02,
+    'Qu': 0.01,
+    'R': 0.06,
+    'S': 0.05,
+    'T': 0.06,
+    'U': 0.04,
+    'V': 0.02,
+    'W': 0.02,
+    'X': 0.01,
+    'Y': 0.02,
+    'Z': 0.01,
+}
+LETTERS = list(LETTER_WEIGHTS)
+WEIGHTS = [LETTER_WEIGHTS[letter] for letter in LETTERS]
+# Tile types that act every turn on their own
+SPECIAL_TYPES = ('poison', 'attack')
+
+class TileState:
+    '''
+    Everything the rules need to know about one tile. Mirrors the
+    attributes of the same name on ui.Tile.
+    '''
+    __slots__ = ('col', 'event_timer', 'first_turn', 'letter', 'marked', 'multiplier', 'row', 'tile_type')
+
+    def __init__(self, col, row, letter, tile_type='normal', event_timer=5, first_turn=True, multiplier=1, marked=False):
+        self.col = col
+        self.event_timer = event_timer
+        self.first_turn = first_turn
+        self.letter = letter
+        self.marked = marked
+        self.multiplier = multiplier
+        self.row = row
+        self.tile_type = tile_type
+
+    @classmethod
+    def from_tile(cls, tile):
+        return cls(tile.col, tile.row, tile.letter, tile.tile_type, tile.event_timer, tile.first_turn, tile.multiplier, tile.marked)
+
+    def copy(self, **changes):
+        state = TileState(self.col, self.row, self.letter, self.tile_type, self.event_timer, self.first_turn, self.multiplier, self.marked)
+        for name, value in changes.items():
+            setattr(state, name, value)
+        return state
+
+    def identify(self):
+        return f'c{self.col}r{self.row}'
+
+    @property
+    def point_value(self):
+        return point_value(self.letter, self.tile_type, self.multiplier)
+
+class BoardState:
+    '''
+    A board as the rules see it. tiles maps (col, row) to TileStates, or
+    to anything with the same attributes (the game hands over its
+    ui.Tiles); the rules only ever read them. specials lists the
+    positions of the poison and attack tiles, the ones that act every
+    turn, in board order (by column, then row); when two attack tiles go
+    off together, the first one listed strikes first. It is found from
+    tiles when not given.
+    '''
+    def __init__(self, topology, tiles, hp, hp_max, specials=None):
+        self.hp = hp
+        self.hp_max = hp_max
+        if specials is None:
+            specials = sorted(pos for pos, tile in tiles.items() if tile.tile_type in SPECIAL_TYPES)
+        self.specials = specials
+        self.tiles = tiles # (col, row) -> TileState
+        self.topology = topology
+
+    def neighbors(self, tile):
+        return [self.tiles[pos] for pos in self.topology.neighbors[(tile.col, tile.row)] if pos in self.tiles]
+
+    def direction(self, tile, source_tile):
+        return self.topology.direction((source_tile.col, source_tile.row), (tile.col, tile.row))
+
+def apply_hp(event, hp, hp_max):
+    '''
+    (hp, hp_max) once event has landed. A heal is capped against the HP
+    at that moment, not at submit time, so damage earlier in the same turn
+    leaves room for it; a heal landing at full HP raises the max instead.
+    '''
+    if event.heal:
+        if hp == hp_max:
+            return hp, hp_max + event.heal
+        return min(hp + event.heal, hp_max), hp_max
+    return hp + event.hp_change, hp_max
+
+def choose_letter(rng=random):
+    return rng.choices(population=LETTERS, weights=WEIGHTS, k=1)[0]
+
+def letter_value(letter):
+    if letter in 'AEILNORSTU':
+        return 1
+    elif letter in 'DG':
+        return 2
+    elif letter in 'BCMP':
+        return 3
+    elif letter in 'FHVWY':
+        return 4
+    elif letter == 'K':
+        return 5
+    elif letter in 'JX':
+        return 8
+    else:
+        return 10
+
+def point_value(letter, tile_type, multiplier):
+    if tile_type in ('heal', 'poison'):
+        return multiplier
+    type_multiplier = 1
+    if tile_type == 'silver':
+        type_multiplier = 3
+    elif tile_type == 'gold':
+        type_multiplier = 4
+    return letter_value(letter) * multiplier * type_multiplier
+
+def play_turn(state, path, rng=random, ghost_color_override=None):
+    '''
+    Plays one turn: the word traced through path (a list of (col, row)
+    positions, empty for a scramble) is cleared, then poison and attack
+    tiles act. Returns the events that took effect, in the order they
+    did, without building the board they leave behind; state and its
+    tiles are left untouched.
+
+    Each event records its outcome: event.hp_change, the damage it did,
+    event.heal, the HP it offered (applied by apply_hp()), and
+    event.result, the tile at event.tile's position afterwards (for
+    removals, the fresh tile that will drop in from above, with letters
+    drawn from rng). Special tile rolls are left to the caller.
+    '''
+    queue = queue_turn(state, [state.tiles[pos] for pos in path], ghost_color_override)
+    hp, hp_max = state.hp, state.hp_max
+    removed = {} # tile -> fresh TileState, in removal order
+    resolved = []
+    while queue:
+        for event in queue.pop_batch():
+            tile = event.tile
+            if tile in removed:
+                continue
+            action = event.event
+            if action == 'heal':
+                event.heal = tile.multiplier
+                removed[tile] = event.result = refill(tile, rng)
+            elif action in ('explode', 'gold', 'kill', 'remove'):
+                if not event.active:
+                    continue
+                removed[tile] = event.result = refill(tile, rng)
+                queue.discard_source(tile)
+            elif action == 'poison':
+                result = TileState.from_tile(tile)
+                result.event_timer -= 1
+                if result.first_turn:
+                    result.first_turn = False
+                elif result.event_timer == 0:
+                    result.tile_type = 'stone'
+                    result.letter = '__'
+                    result.marked = False
+                event.hp_change = -tile.multiplier
+                event.result = result
+            elif action == 'attack':
+                event.hp_change = -tile.point_value
+                removed[tile] = event.result = refill(tile, rng)
+            elif action == 'tick':
+                result = TileState.from_tile(tile)
+                result.event_timer -= 1
+                if result.first_turn:
+                    result.first_turn = False
+                elif result.event_timer == 0:
+                    result.marked = False
+                event.result = result
+            hp, hp_max = apply_hp(event, hp, hp_max)
+            resolved.append(event)
+    return resolved
+
+def queue_turn(state, snake, ghost_color_override=None):
+    queue = events.EventQueue()
+    for tile in snake:
+        if tile.tile_type == 'heal':
+            queue.add(events.Event('heal', tile, 0))
+        elif tile.tile_type == 'gold':
+            for event in events.resolve_gold_cascade(tile, state.neighbors, state.direction):
+                queue.add(event)
+        else:
+            queue.add(events.Event('remove', tile, 2, ghost_color_override=ghost_color_override))
+    for pos in state.specials:
+        tile = state.tiles[pos]
+        if tile.tile_type == 'poison':
+            queue.add(events.Event('poison', tile, 4))
+        elif tile.event_timer == 1:
+            queue.add(events.Event('attack', tile, 5))
+            for t in state.neighbors(tile):
+                queue.add(events.Event('kill', t, 5, source_tile=tile, ghost_color_override='red', direction=state.direction(t, tile)))
+        else:
+            queue.add(events.Event('tick', tile, 6))
+    return queue
+
+def refill(tile, rng=random):
+    # The fresh tile that replaces tile once it is removed
+    return TileState(tile.col, tile.row, choose_letter(rng), multiplier=tile.multiplier)
+
+def resolve_turn(state, path, rng=random, ghost_color_override=None):
+    '''
+    play_turn(), plus the board the turn leaves behind. Returns
+    (new_state, events). Removed tiles are refilled and land on top of
+    their column, the last one removed highest. state's tiles should be
+    TileStates here; the ones the turn left in place are shared with
+    new_state rather than copied.
+    '''
+    resolved = play_turn(state, path, rng, ghost_color_override)
+    return settle(state, resolved), resolved
+
+def settle(state, resolved):
+    # The board after the events in resolved, with each column fallen
+    tiles = dict(state.tiles)
+    removed = {} # col -> [fresh TileState, ...], in removal order
+    hp, hp_max = state.hp, state.hp_max
+    for event in resolved:
+        pos = (event.tile.col, event.tile.row)
+        if event.event in ('poison', 'tick'):
+            tiles[pos] = event.result
+        else:
+            removed.setdefault(pos[0], []).append(event.result)
+            del tiles[pos]
+        hp, hp_max = apply_hp(event, hp, hp_max)
+    for col, fresh in removed.items():
+        column = list(reversed(fresh)) + [tiles.pop((col, row)) for row in range(state.topology.rows(col)) if (col, row) in tiles]
+        for row, tile in enumerate(column):
+            tiles[(col, row)] = tile if tile.row == row else tile.copy(row=row)
+    specials = [pos for pos in state.specials if pos[0] not in removed and tiles[pos].tile_type in SPECIAL_TYPES]
+    specials += [(col, row) for col in removed for row in range(state.topology.rows(col)) if tiles[(col, row)].tile_type in SPECIAL_TYPES]
+    return BoardState(state.topology, tiles, hp, hp_max, sorted(specials))
@@ -0,0 +1,33 @@
+import heapq
+from itertools import count
+
+class Scheduler:
+    '''
+    Runs callbacks from the main loop once enough frame time has passed.
+    Nothing runs on another thread, so scheduled game logic never races the
+    renderer. Steps scheduled from inside a callback are timed from the
+    frame that ran it, so a slow frame delays a cascade instead of bunching
+    its steps together.
+    '''
+    def __init__(self, step_duration=0.2):
+        self.now = 0
+        self.order = count()
+        self.pending = [] # heap of (due, order, callback)
+        self.step_duration = step_duration
+
+    def clear(self):
+        self.pending = []
+
+    def idle(self):
+        return not self.pending
+
+    def schedule(self, callback, delay=None):
+        if delay is None:
+            delay = self.step_duration
+        heapq.heappush(self.pending, (self.now + delay, next(self.order), callback))
+
+    def update(self, dt):
+        self.now += dt
+        while self.pending and self.pending[0][0] <= self.now:
+            _, _, callback = heapq.heappop(self.pending)
+            callback()
@@ -0,0 +1,110 @@
+from collections import deque
+
+class BoardSolver:
+    '''
+    Enumerates every dictionary word that can be traced on the board.
+
+    The board is given as {(col, row): letter} for tiles that can be part
+    of a word, and adjacency as {(col, row): [(col, row), ...]}. Search is
+    depth-first over tile paths, pruned by the dictionary's prefix
+    automaton, so only paths that are still the start of some word are
+    extended.
+
+    Results are kept between calls: update() diffs the board against the
+    last one it saw, drops only the paths through tiles that changed and
+    searches only for paths that touch them.
+    '''
+    min_length = 3
+
+    def __init__(self, automaton):
+        self.automaton = automaton
+        self.by_pos = {} # (col, row) -> {(word, path), ...}
+        self.letters = {}
+        self.paths = {} # word -> {path, ...}; path is a tuple of positions
+
+    def add(self, word, path):
+        self.paths.setdefault(word, set()).add(path)
+        for pos in path:
+            self.by_pos.setdefault(pos, set()).add((word, path))
+
+    def discard(self, word, path):
+        paths = self.paths[word]
+        paths.discard(path)
+        if not paths:
+            del self.paths[word]
+        for pos in path:
+            if pos in self.by_pos:
+                self.by_pos[pos].discard((word, path))
+
+    def distances(self, changed, neighbors):
+        # Steps from each position to the nearest changed one
+        distance = {pos: 0 for pos in changed}
+        frontier = deque(changed)
+        while frontier:
+            pos = frontier.popleft()
+            for n in neighbors.get(pos, ()):
+                if n not in distance:
+                    distance[n] = distance[pos] + 1
+                    frontier.append(n)
+        return distance
+
+    def search(self, letters, neighbors, changed=None):
+        '''
+        Yields (word, path) for every traceable word. If changed is given,
+        only paths through at least one of those positions are searched;
+        a path that has not reached one yet is abandoned as soon as no word
+        below its automaton state is long enough to get there.
+        '''
+        automaton = self.automaton
+        min_length = self.min_length
+        if changed is not None:
+            distance = self.distances(changed, neighbors)
+            unreachable = len(letters) + 1
+
+        def extend(path, word, state, touched):
+            if touched and len(word) >= min_length and automaton.is_word(state):
+                yield word, tuple(path)
+            for pos in neighbors[path[-1]]:
+                letter = letters.get(pos)
+                if letter is None or pos in path:
+                    continue
+                next_state = automaton.step(state, letter.lower())
+                if next_state is None:
+                    continue
+                next_touched = touched or pos in changed
+                if not next_touched and distance.get(pos, unreachable) > automaton.height(next_state):
+                    continue
+                path.append(pos)
+                yield from extend(path, word + letter, next_state, next_touched)
+                path.pop()
+
+        for pos, letter in letters.items():
+            state = automaton.step(automaton.start, letter.lower())
+            if state is None:
+                continue
+            touched = changed is None or pos in changed
+            if not touched and distance.get(pos, unreachable) > automaton.height(state):
+                continue
+            yield from extend([pos], letter, state, touched)
+
+    def solve(self, letters, neighbors):
+        self.by_pos = {}
+        self.letters = dict(letters)
+        self.paths = {}
+        for word, path in self.search(self.letters, neighbors):
+            self.add(word, path)
+        return self.paths
+
+    def update(self, letters, neighbors):
+        if not self.letters:
+            return self.solve(letters, neighbors)
+        changed = {pos for pos in self.letters.keys() | letters.keys() if letters.get(pos) != self.letters.get(pos)}
+        if not changed:
+            return self.paths
+        self.letters = dict(letters)
+        for pos in changed:
+            for word, path in self.by_pos.pop(pos, set()):
+                self.discard(word, path)
+        for word, path in self.search(self.letters, neighbors, changed):
+            self.add(word, path)
+        return self.paths
@@ -0,0 +1,108 @@
+'''
+Gold cascade precedences, as laid out in logic.txt: the gold tile in the
+snake fires at 3, the tiles around it are taken out at its precedence and
+gold tiles among them fire one step later, taking out their own
+neighbors at that later precedence.
+
+    python -m pytest test_events.py
+'''
+
+import events
+
+class FakeTile:
+    def __init__(self, name, tile_type='normal'):
+        self.name = name
+        self.tile_type = tile_type
+
+    def __repr__(self):
+        return self.name
+
+def board(layout, links):
+    # layout: name -> tile_type; links: name -> neighbor names, in order
+    tiles = {name: FakeTile(name, tile_type) for name, tile_type in layout.items()}
+    def neighbors(tile):
+        return [tiles[name] for name in links.get(tile.name, ())]
+    def direction(tile, source):
+        return f'{source.name}>{tile.name}'
+    return tiles, neighbors, direction
+
+def resolve(tiles, neighbors, direction, origin='g0'):
+    cascade = events.resolve_gold_cascade(tiles[origin], neighbors, direction)
+    return {e.tile.name: (e.event, e.precedence, e.source_tile.name) for e in cascade}, cascade
+
+def test_lone_gold_tile():
+    tiles, neighbors, direction = board({'g0': 'gold'}, {})
+    claimed, cascade = resolve(tiles, neighbors, direction)
+    assert claimed == {'g0': ('gold', 3, 'g0')}
+    assert len(cascade) == 1
+
+def test_explode_and_heal_neighbors():
+    tiles, neighbors, direction = board(
+        {'g0': 'gold', 'a': 'normal', 'h': 'heal', 's': 'silver'},
+        {'g0': ['a', 'h', 's']})
+    claimed, cascade = resolve(tiles, neighbors, direction)
+    assert claimed == {
+        'g0': ('gold', 3, 'g0'),
+        'a': ('explode', 3, 'g0'),
+        'h': ('heal', 3, 'h'),
+        's': ('explode', 3, 'g0'),
+    }
+    explode = next(e for e in cascade if e.tile.name == 'a')
+    assert explode.ghost_color_override == 'gold'
+    assert explode.direction == 'g0>a'
+    heal = next(e for e in cascade if e.tile.name == 'h')
+    assert heal.ghost_color_override is None
+
+def test_chained_gold_fires_one_step_later():
+    tiles, neighbors, direction = board(
+        {'g0': 'gold', 'g1': 'gold', 'g2': 'gold', 'a': 'normal', 'b': 'normal', 'h': 'heal'},
+        {'g0': ['g1'], 'g1': ['g0', 'a', 'g2'], 'g2': ['g1', 'b', 'h']})
+    claimed, _ = resolve(tiles, neighbors, direction)
+    assert claimed == {
+        'g0': ('gold', 3, 'g0'),
+        'g1': ('gold', 4, 'g1'),
+        'a': ('explode', 4, 'g1'),
+        'g2': ('gold', 5, 'g2'),
+        'b': ('explode', 5, 'g2'),
+        'h': ('heal', 5, 'h'),
+    }
+
+def test_shared_neighbor_claimed_by_first_gold_reached():
+    # x borders both g0 and g1. The walk is depth-first, so whichever of
+    # the two reaches x first claims it, at that gold tile's precedence.
+    links = {'g0': ['g1', 'x'], 'g1': ['g0', 'x']}
+    tiles, neighbors, direction = board({'g0': 'gold', 'g1': 'gold', 'x': 'normal'}, links)
+    claimed, cascade = resolve(tiles, neighbors, direction)
+    assert claimed['x'] == ('explode', 4, 'g1')
+    assert [e.tile.name for e in cascade].count('x') == 1
+
+    links['g0'] = ['x', 'g1']
+    tiles, neighbors, direction = board({'g0': 'gold', 'g1': 'gold', 'x': 'normal'}, links)
+    claimed, cascade = resolve(tiles, neighbors, direction)
+    assert claimed['x'] == ('explode', 3, 'g0')
+    assert [e.tile.name for e in cascade].count('x') == 1
+
+def test_shared_heal_neighbor_heals_once():
+    tiles, neighbors, direction = board(
+        {'g0': 'gold', 'g1': 'gold', 'h': 'heal'},
+        {'g0': ['g1', 'h'], 'g1': ['g0', 'h']})
+    _, cascade = resolve(tiles, neighbors, direction)
+    assert [(e.event, e.precedence) for e in cascade if e.tile.name == 'h'] == [('heal', 4)]
+
+def test_events_in_queue_order():
+    # Each gold event comes after the events it set off
+    tiles, neighbors, direction = board(
+        {'g0': 'gold', 'a': 'normal', 'g1': 'gold', 'b': 'normal', 'c': 'normal'},
+        {'g0': ['a', 'g1', 'c'], 'g1': ['b']})
+    _, cascade = resolve(tiles, neighbors, direction)
+    assert [e.tile.name for e in cascade] == ['a', 'b', 'g1', 'c', 'g0']
+
+def test_long_gold_chain_does_not_recurse():
+    count = 5000
+    layout = {f'g{i}': 'gold' for i in range(count)}
+    links = {f'g{i}': [f'g{i - 1}', f'g{i + 1}'] for i in range(1, count - 1)}
+    links['g0'] = ['g1']
+    tiles, neighbors, direction = board(layout, links)
+    claimed, cascade = resolve(tiles, neighbors, direction)
+    assert len(cascade) == count
+    assert claimed[f'g{count - 2}'] == ('gold', count + 1, f'g{count - 2}')
@@ -0,0 +1,61 @@
+'''
+HP over a turn that both damages and heals. Heals are capped against the
+HP at the moment they land, so poison resolving before a heal leaves room
+for it.
+
+    python -m pytest test_rules.py
+'''
+
+import random
+
+import hexgrid, rules
+
+def board(hp, hp_max, specials):
+    # A plain board of 'A' tiles; specials: (col, row) -> (tile_type, multiplier)
+    topology = hexgrid.HexTopology(cols=7)
+    tiles = {pos: rules.TileState(*pos, 'A') for pos in topology.positions}
+    for pos, (tile_type, multiplier) in specials.items():
+        tiles[pos] = rules.TileState(*pos, 'A', tile_type, multiplier=multiplier)
+    return rules.BoardState(topology, tiles, hp, hp_max)
+
+def gold_chain(heal, hp, hp_max, poison):
+    # g0 fires at 3, (0, 1) at 4 and (0, 2) at 5, which takes the heal tile
+    # at (0, 3) out at 5, after the poison tile at 4
+    return board(hp, hp_max, {
+        (0, 0): ('gold', 1),
+        (0, 1): ('gold', 1),
+        (0, 2): ('gold', 1),
+        (0, 3): ('heal', heal),
+        (6, 6): ('poison', poison),
+    })
+
+def hp_after(state, path):
+    new_state, resolved = rules.resolve_turn(state, path, random.Random(0))
+    return (new_state.hp, new_state.hp_max), [(e.event, e.precedence) for e in resolved if e.event in ('heal', 'poison')]
+
+def test_heal_after_damage_restores_hp():
+    # Full HP at submit time, but not once the poison has landed
+    state = gold_chain(heal=2, hp=10, hp_max=10, poison=3)
+    hp, order = hp_after(state, [(0, 0)])
+    assert order == [('poison', 4), ('heal', 5)]
+    assert hp == (9, 10)
+
+def test_heal_after_damage_capped_at_max():
+    state = gold_chain(heal=3, hp=9, hp_max=10, poison=1)
+    hp, _ = hp_after(state, [(0, 0)])
+    assert hp == (10, 10)
+
+def test_heal_at_full_hp_raises_max_before_damage():
+    state = board(10, 10, {(3, 3): ('heal', 2), (6, 6): ('poison', 3)})
+    hp, order = hp_after(state, [(3, 3)])
+    assert order == [('heal', 0), ('poison', 4)]
+    assert hp == (7, 12)
+
+def test_play_turn_and_settle_agree():
+    state = gold_chain(heal=2, hp=10, hp_max=10, poison=3)
+    resolved = rules.play_turn(state, [(0, 0)], random.Random(0))
+    hp, hp_max = state.hp, state.hp_max
+    for event in resolved:
+        hp, hp_max = rules.apply_hp(event, hp, hp_max)
+    settled = rules.settle(state, resolved)
+    assert (settled.hp, settled.hp_max) == (hp, hp_max) == (9, 10)
@@ -1,15 +1,21 @@
 class Snake():
-    def __init__(self):
+    def __init__(self, automaton):
+        self.automaton = automaton
         self.last = None
         self.length = 0
         self.letters = []
+        self.states = [] # Automaton state after each tile
         self.tiles = []
         self.word = ''
 
     def add(self, tile):
         if tile.tile_type != 'stone':
             self.tiles.append(tile)
-            self.update()
+            self.letters.append(tile.letter)
+            self.states.append(self.automaton.step(self.state, tile.letter.lower()))
+            self.word += tile.letter
+            self.length = len(self.word)
+            self.last = tile
 
     def empty(self):
         if not self.tiles:
@@ -22,11 +28,37 @@ class Snake():
         self.tiles = []
         self.update()
 
+    def is_prefix(self):
+        # False once no dictionary word starts with the current letters
+        return self.state is not None
+
+    def is_word(self):
+        return self.automaton.is_word(self.state)
+
+    @property
+    def state(self):
+        return self.states[-1] if self.states else self.automaton.start
+
+    def trim(self, index):
+        while len(self.tiles) > index:
+            self.tiles.pop()
+            self.states.pop()
+            letter = self.letters.pop()
+            self.word = self.word[:len(self.word) - len(letter)]
+        self.length = len(self.word)
+        self.last = self.tiles[-1] if self.tiles else None
+
     def update(self):
         self.letters = [t.letter for t in self.tiles]
         self.word = ''.join(self.letters)
         self.length = len(self.word)
 
+        state = self.automaton.start
+        self.states = []
+        for letter in self.letters:
+            state = self.automaton.step(state, letter.lower())
+            self.states.append(state)
+
         if self.tiles:
             self.last = self.tiles[-1]
         else:
@@ -0,0 +1,79 @@
+'''
+Diagnostics for the game, kept in a ring buffer of recent records so they
+can be dumped after a crash.
+
+Messages are str.format() templates. Any argument that is callable is
+called only if the record is kept, so
+
+    tracer.debug('events', '{} removed', tile.identify)
+
+costs a level check and nothing else while debug records are off. Each
+record belongs to a category ('events', 'snake', 'persistence', ...);
+set tracer.categories to a set of them to keep only those.
+'''
+
+import sys, time
+from collections import deque
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+
+LEVEL_NAMES = {DEBUG: 'DEBUG', INFO: 'INFO', WARNING: 'WARNING', ERROR: 'ERROR'}
+
+class Tracer:
+    def __init__(self, capacity=2000, level=INFO):
+        self.buffer = deque(maxlen=capacity) # (time, level, category, message)
+        self.categories = None # None keeps every category
+        self.echo = False
+        self.level = level
+        self.start = time.monotonic()
+
+    def configure(self, level=None, categories=None, echo=None):
+        if level is not None:
+            self.level = level
+        if categories is not None:
+            self.categories = set(categories) or None
+        if echo is not None:
+            self.echo = echo
+
+    def debug(self, category, msg, *args):
+        if self.level <= DEBUG:
+            self.record(DEBUG, category, msg, args)
+
+    def dump(self, path):
+        with open(path, 'w', encoding='utf-8') as file:
+            for record in self.buffer:
+                file.write(format_record(record) + '\n')
+        return path
+
+    def error(self, category, msg, *args):
+        if self.level <= ERROR:
+            self.record(ERROR, category, msg, args)
+
+    def info(self, category, msg, *args):
+        if self.level <= INFO:
+            self.record(INFO, category, msg, args)
+
+    def record(self, level, category, msg, args):
+        # Errors are kept whatever the category filter
+        if level < ERROR and self.categories is not None and category not in self.categories:
+            return
+        if args:
+            msg = msg.format(*[arg() if callable(arg) else arg for arg in args])
+        record = (time.monotonic() - self.start, level, category, msg)
+        self.buffer.append(record)
+        if self.echo:
+            print(format_record(record), file=sys.stderr)
+
+    def warning(self, category, msg, *args):
+        if self.level <= WARNING:
+            self.record(WARNING, category, msg, args)
+
+def format_record(record):
+    seconds, level, category, msg = record
+    return f'{seconds:9.3f} {LEVEL_NAMES[level]:<7} {category:<11} {msg}'
+
+# Shared by the whole game
+tracer = Tracer()
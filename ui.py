@@ -1,6 +1,9 @@
 import os, pygame, random
+from collections import OrderedDict
 from math import ceil, floor, sqrt
 
+import rules
+
 class BaseObj:
     def __init__(self, dims, coords, fonts, colors):
         self.colors = colors
@@ -9,12 +12,33 @@ class BaseObj:
         self.border_color = self.colors['mid_gray']
         self.coords = coords
         self.dims = dims
+        self.dirty = True # Set whenever surf changes; cleared once drawn
         self.interactive = False
+        self.look = None # State surf was last built from
+        self.stale = False # State changed since; surf is rebuilt when next read
         self.surf = pygame.Surface(self.dims)
 
     def get_abs_rect(self):
         return pygame.Rect(self.coords, self.dims)
 
+    def refresh(self):
+        if self.stale:
+            self.build_image()
+
+    @property
+    def surf(self):
+        self.refresh()
+        return self._surf
+
+    @surf.setter
+    def surf(self, surf):
+        self._surf = surf
+
+    def touch(self):
+        # Marks surf stale if the state it shows has changed
+        if self.get_look() != self.look:
+            self.stale = True
+
 class Display(BaseObj):
     def __init__(self, dims, coords, fonts, colors, text=None, text_color=None, text_prefix='', center=False, vert_center=True, text_offset=[0, 0], label=None, show_progress=None, multicolor=False, gif=None):
         super(Display, self).__init__(dims=dims, coords=coords, fonts=fonts, colors=colors)
@@ -24,6 +48,7 @@ class Display(BaseObj):
         self.border_color = self.colors['mid_gray']
         self.gif = gif
         self.gif_frame = 0
+        self.history = None # Word list entries from set_multiline_text()
         self.hovered = False
         self.label = label
         self.letter_height = 19
@@ -51,6 +76,9 @@ class Display(BaseObj):
         self.build_image()
 
     def build_image(self):
+        self.dirty = True
+        self.stale = False
+        self.look = self.get_look()
         self.surf.fill(self.border_color)
         pygame.draw.rect(self.surf, self.bg_color, pygame.Rect((2, 2), (self.dims[0] - 4, self.dims[1] - 4)))
         if self.show_progress:
@@ -59,30 +87,38 @@ class Display(BaseObj):
             pygame.draw.rect(self.surf, self.colors['bg_progress'], pygame.Rect((2, self.dims[1] - 6), (self.progress_bar_max_width, 4)))
             bar_width = floor((self.progress / self.progress_max) * self.progress_bar_max_width)
             pygame.draw.rect(self.surf, self.colors['progress'], pygame.Rect((2, self.dims[1] - 6), (bar_width, 4)))
+            text = atlas(self.fonts['small'], self.colors['mid_gray'], self.bg_color)
             formatted = format_num(self.progress)
-            surf = self.fonts['small'].render(formatted, True, self.colors['mid_gray'], self.bg_color)
-            self.surf.blit(surf, dest=(5, self.dims[1] - surf.get_size()[1] - 8))
+            size = text.size(formatted)
+            text.draw(self.surf, formatted, (5, self.dims[1] - size[1] - 8))
             formatted = format_num(self.progress_max)
-            surf = self.fonts['small'].render(formatted, True, self.colors['mid_gray'], self.bg_color)
-            self.surf.blit(surf, dest=(self.dims[0] - surf.get_size()[0] - 5, self.dims[1] - surf.get_size()[1] - 8))
+            size = text.size(formatted)
+            text.draw(self.surf, formatted, (self.dims[0] - size[0] - 5, self.dims[1] - size[1] - 8))
 
         if self.text:
             # Render text
-            surf = self.fonts['medium'].render(str(self.text), True, self.text_color, self.bg_color)
+            text = atlas(self.fonts['medium'], self.text_color, self.bg_color)
+            formatted = str(self.text)
+            size = text.size(formatted)
             # Horiz align
             if self.center:
-                offset_x = floor((self.surf.get_size()[0] - surf.get_size()[0]) / 2) + self.text_offset[0]
+                offset_x = floor((self.surf.get_size()[0] - size[0]) / 2) + self.text_offset[0]
             else:
                 offset_x = self.text_offset[0]
             # Vert align
             if self.vert_center:
-                offset_y = floor((self.surf.get_size()[1] - surf.get_size()[1]) / 2) + self.text_offset[1]
+                offset_y = floor((self.surf.get_size()[1] - size[1]) / 2) + self.text_offset[1]
             else: offset_y = self.text_offset[1]
-            self.surf.blit(surf, dest=(offset_x, offset_y))
+            text.draw(self.surf, formatted, (offset_x, offset_y))
 
         if self.label:
             self.set_label()
 
+    def clear_history(self):
+        # Back to a plain display, built by build_image()
+        self.history = None
+        self.touch()
+
     def cycle_marquee(self):
         if self.marquee_timer > 0:
             self.marquee_timer += 1
@@ -98,7 +134,21 @@ class Display(BaseObj):
             self.marquee_current = int(not self.marquee_current)
         self.border_color = self.marquee_colors[self.marquee_current]
 
+    def get_look(self):
+        return (self.text, self.label, tuple(self.border_color), tuple(self.bg_color), tuple(self.text_color), tuple(self.text_offset), self.center, self.vert_center, self.progress, self.progress_max, self.text_obj, self.history)
+
+    def refresh(self):
+        if self.stale:
+            if self.history is not None:
+                self.set_multiline_text(self.history)
+            elif self.multicolor:
+                self.set_colored_text()
+            else:
+                self.build_image()
+
     def set_colored_text(self, text_obj=None):
+        self.dirty = True
+        self.stale = False
         self.surf.fill(self.border_color)
         pygame.draw.rect(self.surf, self.bg_color, pygame.Rect((2, 2), (self.dims[0] - 4, self.dims[1] - 4)))
 
@@ -113,7 +163,7 @@ class Display(BaseObj):
                 for entry in text_obj:
                     for index, letter in enumerate(entry['word']):
                         color = entry['colors'][index]
-                        surf = self.fonts['medium'].render(letter, True, self.colors[entry['colors'][index]], self.bg_color)
+                        surf = atlas(self.fonts['medium'], self.colors[entry['colors'][index]], self.bg_color).glyph(letter)
                         if not letter_width:
                             letter_width = surf.get_size()[0]
                         if not letter_height:
@@ -123,13 +173,12 @@ class Display(BaseObj):
                             offset_y = floor((self.dims[1] - letter_height) / 2)
                         self.surf.blit(surf, dest=(offset_x, offset_y))
 
-                        surf = self.fonts['medium'].render(f' (+{entry["value"]})', True, self.colors['beige'], self.bg_color)
                         offset_x += letter_width
-                        self.surf.blit(surf, dest=(offset_x, offset_y))
+                        atlas(self.fonts['medium'], self.colors['beige'], self.bg_color).draw(self.surf, f' (+{entry["value"]})', (offset_x, offset_y))
             else:
                 for index, letter in enumerate(self.text_obj['word']):
                     color = self.text_obj['colors'][index]
-                    surf = self.fonts['medium'].render(letter, True, self.colors[self.text_obj['colors'][index]], self.bg_color)
+                    surf = atlas(self.fonts['medium'], self.colors[self.text_obj['colors'][index]], self.bg_color).glyph(letter)
                     if not letter_width:
                         letter_width = surf.get_size()[0]
                     if not letter_height:
@@ -140,16 +189,17 @@ class Display(BaseObj):
                     self.surf.blit(surf, dest=(offset_x, offset_y))
 
         self.text = ''
+        self.look = self.get_look()
 
         if self.label:
             self.set_label()
 
     def set_label(self):
-        text = self.fonts['small'].render(str(self.label), True, self.colors['mid_gray'], self.bg_color)
-        surf = pygame.Surface((text.get_size()[0] + 20, text.get_size()[1]))
-        surf.fill(self.bg_color)
-        surf.blit(text, (10, 0))
-        self.surf.blit(surf, (14, -2))
+        text = atlas(self.fonts['small'], self.colors['mid_gray'], self.bg_color)
+        label = str(self.label)
+        size = text.size(label)
+        self.surf.fill(self.bg_color, pygame.Rect((14, -2), (size[0] + 20, size[1])))
+        text.draw(self.surf, label, (24, -2))
 
     def set_multiline_text(self, history):
 
@@ -159,25 +209,35 @@ class Display(BaseObj):
             value  - Point value (int)
             colors - Letter colors (list of strings):
         '''
+        self.dirty = True
+        self.history = tuple(history)
+        self.look = self.get_look()
+        self.stale = False
         text = ''
         text_offset = (8, 12)
         container = pygame.Surface(self.dims)
         container.fill(self.bg_color)
 
+        atlases = {'beige': atlas(self.fonts['medium'], self.colors['beige'], self.bg_color)} # color name -> GlyphAtlas
+        blits = []
         for index_hist, d in enumerate(history):
             for index_letter, letter in enumerate(d['word']):
-                surf = self.fonts['medium'].render(letter, True, self.colors[d['colors'][index_letter]], self.bg_color)
+                color = d['colors'][index_letter]
+                if color not in atlases:
+                    atlases[color] = atlas(self.fonts['medium'], self.colors[color], self.bg_color)
+                surf = atlases[color].glyph(letter)
                 if self.letter_width == 19:
                     self.letter_width = surf.get_size()[0]
                 if self.letter_height == 19:
                     self.letter_height = surf.get_size()[1]
                 offset = (text_offset[0] + self.letter_width * index_letter, text_offset[1] + self.letter_height * index_hist)
-                container.blit(surf, dest=offset)
+                blits.append((surf, offset))
 
                 if index_letter == len(d['word']) - 1:
-                    surf = self.fonts['medium'].render(f' (+{d["value"]})', True, self.colors['beige'], self.bg_color)
                     offset = (text_offset[0] + self.letter_width * (index_letter + 1), text_offset[1] + self.letter_height * index_hist)
-                    container.blit(surf, dest=offset)
+                    suffix = f' (+{d["value"]})'
+                    blits.extend((atlases['beige'].glyph(c), (offset[0] + self.letter_width * i, offset[1])) for i, c in enumerate(suffix))
+        container.blits(blits, doreturn=False)
 
         self.surf.blit(container, (0, 0))
         pygame.draw.rect(self.surf, self.bg_color, pygame.Rect((0, 0), (self.dims[0], self.dims[1])), width=15)
@@ -205,16 +265,74 @@ class Display(BaseObj):
         else:
             if self.marquee_timer == -1:
                 self.border_color = self.border_color_override
-        if self.multicolor:
-            self.set_colored_text()
+        self.touch()
+
+class GlyphAtlas:
+    '''
+    Every printable ASCII character of one font, color and background
+    rendered once onto a single strip. Text is drawn by blitting the
+    glyphs' subsurfaces side by side, which the monospace font lines up
+    the same as rendering the whole string. Without a background the strip
+    keeps per-pixel alpha.
+    '''
+    charset = ''.join(chr(c) for c in range(32, 127))
+
+    def __init__(self, font, color, bg_color=None):
+        self.bg_color = bg_color
+        self.color = color
+        self.font = font
+        self.glyphs = {}
+        self.widths = {}
+
+        rendered = [self.render_glyph(c) for c in self.charset]
+        self.height = max(surf.get_height() for surf in rendered)
+        dims = (sum(surf.get_width() for surf in rendered), self.height)
+        if bg_color:
+            self.strip = pygame.Surface(dims)
+            self.strip.fill(bg_color)
+            flags = 0
         else:
-            self.build_image()
+            self.strip = pygame.Surface(dims, pygame.SRCALPHA)
+            flags = pygame.BLEND_RGBA_MAX # Copy the glyphs' alpha as it is
+        x = 0
+        for c, surf in zip(self.charset, rendered):
+            self.strip.blit(surf, (x, 0), special_flags=flags)
+            self.glyphs[c] = self.strip.subsurface(pygame.Rect((x, 0), surf.get_size()))
+            self.widths[c] = surf.get_width()
+            x += surf.get_width()
+
+    def draw(self, surf, text, dest):
+        # Blits text onto surf with its top left at dest
+        x, y = dest
+        blits = []
+        for c in text:
+            blits.append((self.glyph(c), (x, y)))
+            x += self.widths[c]
+        surf.blits(blits, doreturn=False)
+
+    def glyph(self, c):
+        surf = self.glyphs.get(c)
+        if surf is None:
+            # Outside the charset; rendered on first use
+            surf = self.glyphs[c] = self.render_glyph(c)
+            self.widths[c] = surf.get_width()
+        return surf
+
+    def render_glyph(self, c):
+        if self.bg_color:
+            return self.font.render(c, True, self.color, self.bg_color)
+        return self.font.render(c, True, self.color)
+
+    def size(self, text):
+        widths = self.widths
+        return (sum(widths[c] if c in widths else self.glyph(c).get_width() for c in text), self.height)
 
 class HPDisplay():
     def __init__(self, dims, coords, fonts, colors):
         self.dims = dims
         self.colors = colors
         self.coords = coords
+        self.dirty = True
         self.fonts = fonts
         self.hp = 1
         self.hp_color = self.colors['hp_green']
@@ -230,17 +348,20 @@ class HPDisplay():
         self.border_color = self.colors['mid_gray']
 
     def build_image(self):
+        self.dirty = True
         self.surf.fill(self.border_color)
         pygame.draw.rect(self.surf, self.bg_color, pygame.Rect((2, 2), (self.dims[0] - 4, self.dims[1] - 4)))
         bar_width = floor((self.hp_displayed / self.hp_max) * self.bar_max_width)
         pygame.draw.rect(self.surf, self.bg_color_progress, pygame.Rect((2, 10), (self.bar_max_width, self.dims[1] - 18)))
         pygame.draw.rect(self.surf, self.hp_color, pygame.Rect((2, 10), (bar_width, self.dims[1] - 18)))
         hp_display = str(max(round(self.hp_displayed), 0))
-        surf = self.fonts['medium'].render(f'{hp_display} / {str(self.hp_max)}', True, self.colors['light_gray'])
-        self.surf.blit(surf, dest=(floor((self.dims[0] - surf.get_size()[0]) / 2), floor((self.dims[1] - surf.get_size()[1]) / 2)))
-        label = self.fonts['small'].render('HP', True, self.colors['mid_gray'])
-        pygame.draw.line(self.surf, self.bg_color, (14, 0), (label.get_size()[0] + 14 + 20, 0), width=2)
-        self.surf.blit(label, (24, -2))
+        text = atlas(self.fonts['medium'], self.colors['light_gray'])
+        formatted = f'{hp_display} / {str(self.hp_max)}'
+        size = text.size(formatted)
+        text.draw(self.surf, formatted, (floor((self.dims[0] - size[0]) / 2), floor((self.dims[1] - size[1]) / 2)))
+        label = atlas(self.fonts['small'], self.colors['mid_gray'])
+        pygame.draw.line(self.surf, self.bg_color, (14, 0), (label.size('HP')[0] + 14 + 20, 0), width=2)
+        label.draw(self.surf, 'HP', (24, -2))
 
     def level_up(self, lv):
         buff = random.choice([1, 2, 3])
@@ -285,27 +406,36 @@ class Interactive(BaseObj):
         self.build_image()
 
     def build_image(self):
+        self.dirty = True
+        self.stale = False
         self.set_colors()
+        self.look = self.get_look()
         self.surf.fill(self.border_color)
         if self.text:
             pygame.draw.rect(self.surf, self.bg_color, pygame.Rect((2, 2), (self.dims[0] - 4, self.dims[1] - 4)))
             # Render text
-            surf = self.fonts['medium'].render(self.text, True, self.text_color, self.bg_color)
+            text = atlas(self.fonts['medium'], self.text_color, self.bg_color)
+            size = text.size(self.text)
             # Horiz/vert align center
-            offset = tuple([floor((self.dims[i]) - surf.get_size()[i]) / 2 for i in range(2)])
-            self.surf.blit(surf, dest=offset)
+            offset = tuple([floor((self.dims[i]) - size[i]) / 2 for i in range(2)])
+            text.draw(self.surf, self.text, offset)
         if self.img:
             self.surf.blit(self.img, dest=(2, 2))
         if self.label:
             self.set_label()
 
+    def get_look(self):
+        return (self.text, self.label, self.img, tuple(self.border_color), tuple(self.bg_color), tuple(self.text_color))
+
     def mouse_out(self):
-        self.hovered = False
-        self.update()
+        if self.hovered:
+            self.hovered = False
+            self.update()
 
     def mouse_over(self):
-        self.hovered = True
-        self.update()
+        if not self.hovered:
+            self.hovered = True
+            self.update()
 
     def set_colors(self):
         if self.enabled:
@@ -320,15 +450,40 @@ class Interactive(BaseObj):
             self.text_color = self.colors['poison']
 
     def set_label(self):
-        text = self.fonts['small'].render(str(self.label), True, self.colors['light_gray'], self.bg_color)
-        surf = pygame.Surface((text.get_size()[0] + 20, text.get_size()[1]))
-        surf.fill(self.bg_color)
-        surf.blit(text, (10, 0))
-        self.surf.blit(surf, (14, -2))
+        text = atlas(self.fonts['small'], self.colors['light_gray'], self.bg_color)
+        label = str(self.label)
+        size = text.size(label)
+        self.surf.fill(self.bg_color, pygame.Rect((14, -2), (size[0] + 20, size[1])))
+        text.draw(self.surf, label, (24, -2))
 
     def update(self):
         self.set_colors()
-        self.build_image()
+        self.touch()
+
+class SurfaceCache:
+    '''
+    Least recently used cache of finished surfaces, keyed by everything
+    that decides how they look. Surfaces handed out are shared, so they
+    must only ever be read.
+    '''
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self.surfaces = OrderedDict()
+
+    def get(self, key, build):
+        surf = self.surfaces.get(key)
+        if surf is None:
+            self.misses += 1
+            surf = build()
+            self.surfaces[key] = surf
+            if len(self.surfaces) > self.capacity:
+                self.surfaces.popitem(last=False)
+        else:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+        return surf
 
 class Tile():
     def __init__(self, fonts, colors, col=None, row=None, offset=None, letter=None):
@@ -341,11 +496,14 @@ class Tile():
         self.col = col
         self.colors = colors
         self.dims = (48, 48)
+        self.dirty = True
         self.first_turn = True
         self.fonts = fonts
+        self.grid = None
         self.keeb_highlight = False
         self.hovered = False
         self.images = {}
+        self._look = None # Key of the cached image in surf
         self.interactive = True
         self.marked = False
         self.middle = (0, 0)
@@ -354,7 +512,8 @@ class Tile():
         self.point_value = 0
         self.row = row
         self.selected = False
-        self.surf = pygame.Surface(self.dims)
+        self.stale = True # Look changed; surf is rebuilt when next read
+        self._surf = pygame.Surface(self.dims)
         self.text_color = self.colors['black']
         self.tile_type = 'normal'
 
@@ -384,20 +543,19 @@ class Tile():
             self.beacon_counter = min(max(self.beacon_counter, 0), 100)
             self.beacon_counter_dir *= -1
         self.bg_color = self.colors['beacon_red'].lerp(self.colors['bg_attack'], self.beacon_counter / 100.0)
-
-        self.build_image()
-
-    def attack_tick(self):
-        self.event_timer -= 1
-        if self.first_turn:
-            self.first_turn = False
-        else:
-            if self.event_timer == 0:
-                self.beacon = False
-                self.keeb_highlight = False
-                self.marked = False
+        self.stale = True
+
+    def apply_state(self, state):
+        # Take on a tile's state as resolved by rules.play_turn()
+        self.event_timer = state.event_timer
+        self.first_turn = state.first_turn
+        self.letter = state.letter
+        self.marked = state.marked
+        self.tile_type = state.tile_type
+        self.update()
 
     def build_image(self):
+        self.stale = False
         # Set border color
         self.border_color = self.colors['light_gray']
         if self.hovered:
@@ -408,8 +566,81 @@ class Tile():
         if not self.beacon or (self.beacon and self.selected):
             self.bg_color = self.colors[f'bg_{self.tile_type}{"_selected" if self.selected else ""}']
 
-        self.surf.fill(self.border_color)
-        pygame.draw.rect(self.surf, self.bg_color, pygame.Rect((2, 2), (self.dims[0] - 4, self.dims[1] - 4)))
+        # Only attack and poison tiles show their timer
+        event_timer = self.event_timer if self.tile_type in ('attack', 'poison') else None
+        self._look = (self.letter, self.tile_type, self.selected, self.hovered, self.keeb_highlight, self.marked, self.point_value, event_timer, tuple(self.bg_color))
+        old_surf = self._surf
+        self._surf = tile_surfaces.get(self._look, self.render_image)
+        if self._surf is not old_surf:
+            self.dirty = True
+
+    def choose_letter(self):
+        self.letter = rules.choose_letter()
+
+    def get_abs_rect(self):
+        return pygame.Rect(self.coords, self.dims)
+
+    def highlight(self):
+        if not self.keeb_highlight:
+            self.keeb_highlight = True
+            self.stale = True
+
+    @property
+    def letter(self):
+        return self._letter
+
+    @letter.setter
+    def letter(self, letter):
+        old_letter = getattr(self, '_letter', None)
+        self._letter = letter
+        # Keep the board's letter index current
+        if self.grid:
+            self.grid.relabel(self, old_letter)
+
+    @property
+    def look(self):
+        self.refresh()
+        return self._look
+
+    @property
+    def tile_type(self):
+        return self._tile_type
+
+    @tile_type.setter
+    def tile_type(self, tile_type):
+        old_type = getattr(self, '_tile_type', None)
+        self._tile_type = tile_type
+        # Keep the board's special tile index current
+        if self.grid:
+            self.grid.retype(self, old_type)
+
+    def identify(self):
+        return f'c{self.col}r{self.row}'
+
+    def load_images(self):
+        dirname = os.path.dirname(__file__)
+        for img_name in ('attack', 'heal', 'poison'):
+            self.images[img_name] = pygame.image.load(os.path.join(dirname, 'img', img_name + '.png'))
+            self.images[img_name].set_colorkey(self.colors['transparent'])
+
+    def mouse_out(self):
+        if self.hovered:
+            self.hovered = False
+            self.stale = True
+
+    def mouse_over(self):
+        if not self.hovered:
+            self.hovered = True
+            self.stale = True
+
+    def refresh(self):
+        if self.stale:
+            self.build_image()
+
+    def render_image(self):
+        self._surf = pygame.Surface(self.dims)
+        self._surf.fill(self.border_color)
+        pygame.draw.rect(self._surf, self.bg_color, pygame.Rect((2, 2), (self.dims[0] - 4, self.dims[1] - 4)))
 
         if self.tile_type == 'stone':
             surf = pygame.Surface((self.dims[0] - 4, self.dims[1] - 4))
@@ -419,12 +650,12 @@ class Tile():
             # Render point value
             surf_pts = self.fonts['small'].render(str(format_num(self.point_value)), True, self.text_color, self.bg_color)
             # Align bottom/right
-            pts_offset = tuple([self.surf.get_size()[i] - surf_pts.get_size()[i] - 3 for i in range(2)])
-            self.surf.blit(surf_pts, dest=pts_offset)
+            pts_offset = tuple([self._surf.get_size()[i] - surf_pts.get_size()[i] - 3 for i in range(2)])
+            self._surf.blit(surf_pts, dest=pts_offset)
             # Render letter
             surf = self.fonts['large'].render(self.letter, True, self.text_color, self.bg_color)
             # Horiz/vert align center
-            offset = [floor((self.surf.get_size()[i]) - surf.get_size()[i]) / 2 for i in range(2)]
+            offset = [floor((self._surf.get_size()[i]) - surf.get_size()[i]) / 2 for i in range(2)]
             # Bump (-1px, -4px); convert offset
             offset = tuple([offset[0], offset[1] - 4])
             # Countdown timer
@@ -432,93 +663,24 @@ class Tile():
                 surf_timer = self.fonts['small'].render(str(self.event_timer), True, self.colors['black'], self.bg_color)
                 # Align bottom/left
                 timer_offset = (3, self.dims[1] - surf_timer.get_size()[1] - 3)
-                self.surf.blit(surf_timer, dest=timer_offset)
+                self._surf.blit(surf_timer, dest=timer_offset)
             elif self.tile_type == 'poison':
                 surf_timer = self.fonts['small'].render(str(self.event_timer), True, self.colors['light_gray'], self.bg_color)
                 # Align bottom/left
                 timer_offset = (3, self.dims[1] - surf_timer.get_size()[1] - 3)
-                self.surf.blit(surf_timer, dest=timer_offset)
+                self._surf.blit(surf_timer, dest=timer_offset)
 
-        self.surf.blit(surf, dest=offset)
+        self._surf.blit(surf, dest=offset)
 
         if self.tile_type in ('attack', 'heal', 'poison'):
-            self.surf.blit(self.images[self.tile_type], dest=(2, 2))
+            self._surf.blit(self.images[self.tile_type], dest=(2, 2))
 
         if self.marked:
-            pygame.draw.circle(self.surf, self.colors['mid_gray'], (self.dims[0] - 8, 8), 4)
-            pygame.draw.circle(self.surf, self.colors['teal'], (self.dims[0] - 8, 8), 2)
-
-    def choose_letter(self):
-        letter_weights = {
-            'A': 0.09,
-            'B': 0.02,
-            'C': 0.02,
-            'D': 0.04,
-            'E': 0.12,
-            'F': 0.02,
-            'G': 0.03,
-            'H': 0.02,
-            'I': 0.09,
-            'J': 0.01,
-            'K': 0.01,
-            'L': 0.04,
-            'M': 0.03,
-            'N': 0.06,
-            'O': 0.08,
-            'P': 0.02,
-            'Qu': 0.01,
-            'R': 0.06,
-            'S': 0.05,
-            'T': 0.06,
-            'U': 0.04,
-            'V': 0.02,
-            'W': 0.02,
-            'X': 0.01,
-            'Y': 0.02,
-            'Z': 0.01,
-        }
-        pop = [key for key in letter_weights]
-        weights = [letter_weights[letter] for letter in pop]
-        self.letter = random.choices(population=pop, weights=weights, k=1)[0]
-
-    def get_abs_rect(self):
-        return pygame.Rect(self.coords, self.dims)
-
-    def highlight(self):
-        self.keeb_highlight = True
-        self.update()
-
-    def identify(self):
-        return f'c{self.col}r{self.row}'
-
-    def load_images(self):
-        dirname = os.path.dirname(__file__)
-        for img_name in ('attack', 'heal', 'poison'):
-            self.images[img_name] = pygame.image.load(os.path.join(dirname, 'img', img_name + '.png'))
-            self.images[img_name].set_colorkey(self.colors['transparent'])
-
-    def mouse_out(self):
-        self.hovered = False
-        self.border_color = self.colors['light_gray']
-        self.update()
-
-    def mouse_over(self):
-        self.hovered = True
-        self.border_color = self.colors['gold']
-        self.update()
+            pygame.draw.circle(self._surf, self.colors['mid_gray'], (self.dims[0] - 8, 8), 4)
+            pygame.draw.circle(self._surf, self.colors['teal'], (self.dims[0] - 8, 8), 2)
+        return self._surf
 
-    def poison_tick(self):
-        self.event_timer -= 1
-        if self.first_turn:
-            self.first_turn = False
-        else:
-            if self.event_timer == 0:
-                self.beacon = False
-                self.tile_type = 'stone'
-                self.letter = '__'
-                self.marked = False
-
-    def reset(self):
+    def reset(self, letter=None):
         self.event_timer = 5
         self.beacon = False
         self.first_turn = True
@@ -526,14 +688,18 @@ class Tile():
         self.selected = False
         self.tile_type = 'normal'
 
-        self.choose_letter()
+        if letter:
+            self.letter = letter
+        else:
+            self.choose_letter()
         self.update_point_value()
         self.set_text_color()
         self.update()
 
     def select(self):
-        self.selected = True
-        self.update()
+        if not self.selected:
+            self.selected = True
+            self.stale = True
 
     def set_coords(self, dy=0):
         x = self.offset[0] + (self.dims[0] * self.col)
@@ -562,17 +728,24 @@ class Tile():
         else:
             self.text_color = self.colors['black']
 
+    @property
+    def surf(self):
+        self.refresh()
+        return self._surf
+
     def toggle_mark(self):
         self.marked = not self.marked
-        self.update()
+        self.stale = True
 
     def unhighlight(self):
-        self.keeb_highlight = False
-        self.update()
+        if self.keeb_highlight:
+            self.keeb_highlight = False
+            self.stale = True
 
     def unselect(self):
-        self.selected = False
-        self.update()
+        if self.selected:
+            self.selected = False
+            self.stale = True
 
     def update(self, multiplier=None):
         if multiplier:
@@ -580,34 +753,20 @@ class Tile():
 
         self.update_point_value()
         self.set_text_color()
-        self.build_image()
+        self.stale = True
 
     def update_point_value(self):
-        if self.tile_type in ('heal', 'poison'):
-            self.point_value = self.multiplier
-        else:
-            if self.letter in 'AEILNORSTU':
-                value = 1
-            elif self.letter in 'DG':
-                value = 2
-            elif self.letter in 'BCMP':
-                value = 3
-            elif self.letter in 'FHVWY':
-                value = 4
-            elif self.letter == 'K':
-                value = 5
-            elif self.letter in 'JX':
-                value = 8
-            else:
-                value = 10
+        self.point_value = rules.point_value(self.letter, self.tile_type, self.multiplier)
+
+# (font, color, bg_color) -> GlyphAtlas, shared by every text path
+glyph_atlases = SurfaceCache(capacity=64)
 
-            type_multiplier = 1
-            if self.tile_type == 'silver':
-                type_multiplier = 3
-            elif self.tile_type == 'gold':
-                type_multiplier = 4
+# Composited tile images, shared by every Tile
+tile_surfaces = SurfaceCache(capacity=512)
 
-            self.point_value = value * self.multiplier * type_multiplier
+def atlas(font, color, bg_color=None):
+    key = (font, tuple(color), tuple(bg_color) if bg_color else None)
+    return glyph_atlases.get(key, lambda: GlyphAtlas(font, color, bg_color))
 
 def format_num(num):
     if num < 1000: